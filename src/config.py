@@ -3,14 +3,20 @@ Configuration System for SimpleNote Importer
 Handles Phase 2 settings and options
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import yaml
 import json
 
+# Prefer the libyaml-backed loader/dumper; fall back to pure Python when unavailable
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
 
-@dataclass
+
+@dataclass(slots=True)
 class ImportConfig:
     """Configuration for the import process"""
     
@@ -32,11 +38,13 @@ class ImportConfig:
     llm_timeout_sec: int = 30
     llm_max_retries: int = 2
     llm_concurrency: int = 4
+    llm_batch_size: int = 1  # notes per LLM request when classifying a batch
     llm_cache_enabled: bool = True
     llm_cache_path: str = ".cache/llm_category.jsonl"
     llm_min_confidence: float = 0.6
     llm_head_chars: int = 2500
     llm_tail_chars: int = 500
+    llm_attach_diagnostics: bool = True  # add _category_confidence/_reasoning/_provider/_model to metadata
     undecided_policy: str = "other"  # other | suggest
     suggestions_count: int = 3
     propagate_category_tag: bool = True
@@ -69,6 +77,7 @@ class ImportConfig:
     
     # Output Settings
     output_format: str = "obsidian"  # "obsidian", "standard"
+    frontmatter_format: str = "yaml"  # "yaml", "json"
     preserve_original_structure: bool = False
     create_backlinks: bool = False
     
@@ -92,11 +101,12 @@ class ImportConfig:
             return cls()  # Return default config
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                if config_path.suffix.lower() == '.json':
+            if config_path.suffix.lower() == '.json':
+                with open(config_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                else:  # Assume YAML
-                    data = yaml.safe_load(f)
+            else:  # Assume YAML; hand raw bytes to the loader so libyaml decodes them itself
+                with open(config_path, 'rb') as f:
+                    data = yaml.load(f, Loader=_SafeLoader)
             
             return cls(**data)
         except Exception as e:
@@ -108,11 +118,11 @@ class ImportConfig:
         config_path = Path(config_path)
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Convert to dict, excluding private fields
+        # Convert to dict, excluding private fields (slotted instances have no __dict__)
         config_dict = {}
-        for key, value in self.__dict__.items():
-            if not key.startswith('_'):
-                config_dict[key] = value
+        for f in fields(self):
+            if not f.name.startswith('_'):
+                config_dict[f.name] = getattr(self, f.name)
         
         try:
             with open(config_path, 'w', encoding='utf-8') as f:
@@ -122,58 +132,62 @@ class ImportConfig:
     
     def get_phase2_preset(self, preset_name: str) -> 'ImportConfig':
         """Get a pre-configured setup for common use cases"""
-        presets = {
-            'minimal': ImportConfig(
-                enable_editor_pipeline=False,
-                enable_auto_tagging=False,
-                enable_folder_organization=False,
-                enable_content_transformation=False,
-                organize_by_folder=False
-            ),
-            
-            'basic': ImportConfig(
-                enable_editor_pipeline=True,
-                enable_auto_tagging=True,
-                enable_folder_organization=False,
-                enable_content_transformation=True,
-                organize_by_folder=False
-            ),
-            
-            'organized': ImportConfig(
-                enable_editor_pipeline=True,
-                enable_auto_tagging=True,
-                enable_folder_organization=True,
-                enable_content_transformation=True,
-                organize_by_folder=True,
-                folder_structure="tags",
-                create_index_files=False
-            ),
-            
-            'full': ImportConfig(
-                enable_editor_pipeline=True,
-                enable_auto_tagging=True,
-                enable_folder_organization=True,
-                enable_content_transformation=True,
-                organize_by_folder=True,
-                folder_structure="tags",
-                create_index_files=True,
-                create_backlinks=True
-            ),
-            
-            'phase3': ImportConfig(
-                enable_editor_pipeline=True,
-                enable_auto_tagging=True,
-                enable_folder_organization=True,
-                enable_content_transformation=True,
-                enable_note_splitting=True,
-                organize_by_folder=True,
-                folder_structure="tags",
-                split_header_level=2,
-                preserve_main_header=True
-            )
-        }
-        
-        return presets.get(preset_name, ImportConfig())
+        # Only the requested preset is built; callers get a fresh, mutable instance
+        overrides = _PHASE2_PRESETS.get(preset_name)
+        return ImportConfig(**overrides) if overrides else ImportConfig()
+
+
+# Field overrides for each preset, defined once at import time
+_PHASE2_PRESETS: Dict[str, Dict[str, Any]] = {
+    'minimal': dict(
+        enable_editor_pipeline=False,
+        enable_auto_tagging=False,
+        enable_folder_organization=False,
+        enable_content_transformation=False,
+        organize_by_folder=False
+    ),
+    
+    'basic': dict(
+        enable_editor_pipeline=True,
+        enable_auto_tagging=True,
+        enable_folder_organization=False,
+        enable_content_transformation=True,
+        organize_by_folder=False
+    ),
+    
+    'organized': dict(
+        enable_editor_pipeline=True,
+        enable_auto_tagging=True,
+        enable_folder_organization=True,
+        enable_content_transformation=True,
+        organize_by_folder=True,
+        folder_structure="tags",
+        create_index_files=False
+    ),
+    
+    'full': dict(
+        enable_editor_pipeline=True,
+        enable_auto_tagging=True,
+        enable_folder_organization=True,
+        enable_content_transformation=True,
+        organize_by_folder=True,
+        folder_structure="tags",
+        create_index_files=True,
+        create_backlinks=True
+    ),
+    
+    'phase3': dict(
+        enable_editor_pipeline=True,
+        enable_auto_tagging=True,
+        enable_folder_organization=True,
+        enable_content_transformation=True,
+        enable_note_splitting=True,
+        organize_by_folder=True,
+        folder_structure="tags",
+        split_header_level=2,
+        preserve_main_header=True
+    )
+}
 
 
 class ConfigManager:
@@ -221,11 +235,13 @@ class ConfigManager:
             'llm_timeout_sec': 30,
             'llm_max_retries': 2,
             'llm_concurrency': 4,
+            'llm_batch_size': 1,  # >1 sends several notes per request (fewer calls, slightly less accurate)
             'llm_cache_enabled': True,
             'llm_cache_path': '.cache/llm_category.jsonl',
             'llm_min_confidence': 0.6,
             'llm_head_chars': 2500,
             'llm_tail_chars': 500,
+            'llm_attach_diagnostics': True,  # False skips the _category_* diagnostic keys
             'undecided_policy': 'other',  # other | suggest
             'suggestions_count': 3,
             'propagate_category_tag': True,
@@ -274,17 +290,37 @@ class ConfigManager:
             
             '# Output Settings': None,
             'output_format': 'obsidian',
+            'frontmatter_format': 'yaml',  # options: yaml, json (JSON is valid YAML and faster to write)
             'preserve_original_structure': False,
             'create_backlinks': False
         }
         
+        # Split '# ...' section comments from real settings; each comment block is
+        # attached to the first setting that follows it
+        settings = {}
+        section_comments = {}
+        pending_comments = []
+        for key, value in sample_config.items():
+            if key.startswith('#'):
+                pending_comments.append(key)
+            else:
+                if pending_comments:
+                    section_comments[key] = pending_comments
+                    pending_comments = []
+                settings[key] = value
+        
+        # Render all settings with a single dump, then weave the comments back in
+        # above their top-level keys
+        rendered = yaml.dump(settings, Dumper=_SafeDumper, default_flow_style=False, indent=2, sort_keys=False)
+        lines = []
+        for line in rendered.splitlines(keepends=True):
+            if line[:1] not in (' ', '-'):
+                lines.extend(f"{comment}\n" for comment in section_comments.get(line.split(':', 1)[0], ()))
+            lines.append(line)
+        
         try:
             with open(config_file, 'w', encoding='utf-8') as f:
-                for key, value in sample_config.items():
-                    if value is None:  # Comment line
-                        f.write(f"{key}\n")
-                    else:
-                        yaml.dump({key: value}, f, default_flow_style=False, indent=2)
+                f.write(''.join(lines))
                         
             print(f"Sample configuration created: {config_file}")
         except Exception as e:
@@ -304,6 +340,11 @@ class ConfigManager:
         if config.output_format not in valid_formats:
             warnings.append(f"Invalid output_format '{config.output_format}'. Valid options: {valid_formats}")
         
+        # Validate frontmatter format
+        valid_frontmatter_formats = ['yaml', 'json']
+        if config.frontmatter_format not in valid_frontmatter_formats:
+            warnings.append(f"Invalid frontmatter_format '{config.frontmatter_format}'. Valid options: {valid_frontmatter_formats}")
+        
         # Check for conflicting settings
         if not config.enable_folder_organization and config.organize_by_folder:
             warnings.append("organize_by_folder is enabled but enable_folder_organization is disabled")
@@ -324,6 +365,8 @@ class ConfigManager:
                 warnings.append("llm_max_retries must be >= 0")
             if config.llm_concurrency <= 0:
                 warnings.append("llm_concurrency must be >= 1")
+            if config.llm_batch_size <= 0:
+                warnings.append("llm_batch_size must be >= 1")
             if config.llm_head_chars < 0 or config.llm_tail_chars < 0:
                 warnings.append("llm_head_chars and llm_tail_chars must be >= 0")
             # API key env var name presence (soft warning)
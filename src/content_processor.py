@@ -3,18 +3,27 @@ Content Processor for SimpleNote .txt files
 Handles reading and basic processing of note content
 """
 
+import os
+import re
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from .interfaces import FileSystemInterface, RealFileSystem
 
 
+_FIRST_NON_SPACE = re.compile(r'\S')
+
+# Reads are I/O-bound, so oversubscribe the CPU count to keep the disk busy
+DEFAULT_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
 class ContentProcessor:
     """Processes SimpleNote .txt files for content extraction"""
     
-    def __init__(self, notes_directory: Path, file_system: Optional[FileSystemInterface] = None):
+    def __init__(self, notes_directory: Path, file_system: Optional[FileSystemInterface] = None, max_workers: Optional[int] = None):
         self.notes_directory = Path(notes_directory)
         self.file_system = file_system or RealFileSystem()
+        self.max_workers = max_workers or DEFAULT_READ_WORKERS
         
     def get_txt_files(self) -> List[Path]:
         """Get all .txt files from the notes directory"""
@@ -45,11 +54,14 @@ class ContentProcessor:
         Extract title from note content
         Uses first line, removing markdown header syntax if present
         """
-        if not content.strip():
+        # Locate the first line without copying or splitting the whole note
+        match = _FIRST_NON_SPACE.search(content)
+        if match is None:
             return "Untitled"
             
-        lines = content.strip().split('\n')
-        first_line = lines[0].strip()
+        start = match.start()
+        end = content.find('\n', start)
+        first_line = (content[start:end] if end != -1 else content[start:]).strip()
         
         # Remove markdown header syntax
         if first_line.startswith('#'):
@@ -106,8 +118,14 @@ class ContentProcessor:
         
         print(f"Found {len(txt_files)} .txt files")
         
-        for file_path in txt_files:
-            note_data = self.get_note_data(file_path)
+        # Overlap file reads across threads; map() keeps results in input order
+        # (imported here so --help and argument errors don't pay for concurrent.futures)
+        from concurrent.futures import ThreadPoolExecutor
+        workers = min(self.max_workers, len(txt_files)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self.get_note_data, txt_files))
+        
+        for file_path, note_data in zip(txt_files, results):
             if note_data:
                 notes.append(note_data)
             else:
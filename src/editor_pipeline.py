@@ -3,23 +3,54 @@ Editor Pipeline Framework
 Extensible system for content transformations and enhancements during import
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 from .pipelines import ContentProcessor, TagInjector, FolderOrganizer, ContentTransformer, NoteSplitter
 
+# Pipeline copy held by each process_many worker, set once by the pool initializer
+_worker_pipeline: Optional['EditorPipeline'] = None
+
+
+def _init_worker(pipeline: 'EditorPipeline'):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _process_chunk_in_worker(items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+    try:
+        return [_worker_pipeline.process(content, metadata, context) for content, metadata, context in items]
+    finally:
+        # Worker copies of processors go away with the pool, so finish buffered work per chunk
+        _worker_pipeline.close()
+
 
 class EditorPipeline:
     """Main pipeline that orchestrates content processing with conditional execution"""
     
     def __init__(self):
-        self.processors: List[ContentProcessor] = []
+        self.processors = []
+    
+    @property
+    def processors(self) -> List[ContentProcessor]:
+        """Processors in run order; change them with add_processor/remove_processor or by assigning a new list"""
+        return self._processors
+    
+    @processors.setter
+    def processors(self, processors: List[ContentProcessor]):
+        self._processors = list(processors)
+        self._rebuild_safe_processors()
     
     def add_processor(self, processor: ContentProcessor):
         """Add a processor to the pipeline"""
-        self.processors.append(processor)
+        self._processors.append(processor)
+        self._rebuild_safe_processors()
     
     def remove_processor(self, processor_name: str):
         """Remove a processor by name"""
-        self.processors = [p for p in self.processors if p.name != processor_name]
+        self.processors = [p for p in self._processors if p.name != processor_name]
+    
+    def _rebuild_safe_processors(self):
+        # Error-handling wrappers for the processors, built here so process() doesn't check the list per note
+        self._safe_processors = [self._make_safe(processor) for processor in self._processors]
     
     def process(self, content: str, metadata: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """
@@ -33,21 +64,90 @@ class EditorPipeline:
         Returns:
             Tuple of (processed_content, processed_metadata)
         """
+        # Processors copy metadata before changing it, so the caller's dict is never
+        # mutated and no defensive copy is needed here
         current_content = content
-        current_metadata = metadata.copy()
+        current_metadata = metadata
+        
+        # Each processor decides whether to run based on current metadata/context
+        for safe_process in self._safe_processors:
+            current_content, current_metadata = safe_process(current_content, current_metadata, context)
         
+        return current_content, current_metadata
+    
+    def prepare_batch(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> None:
+        """
+        Let processors do batch work (e.g. concurrent LLM calls) before notes are processed one by one
+        
+        Args:
+            items: (content, metadata, context) tuples that will be passed to process()
+        """
+        for processor in self.processors:
+            try:
+                processor.prepare_batch(items)
+            except Exception as e:
+                print(f"Warning: Processor {processor.name} failed to prepare batch: {e}")
+    
+    def close(self) -> None:
+        """Let processors finish buffered work (e.g. cache writes) once a run of notes is done"""
         for processor in self.processors:
             try:
-                # Each processor decides whether to run based on current metadata/context
-                current_content, current_metadata = processor.process(
-                    current_content, current_metadata, context
-                )
+                processor.close()
+            except Exception as e:
+                print(f"Warning: Processor {processor.name} failed to close: {e}")
+    
+    def process_many(self, items: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+                     max_workers: Optional[int] = None, chunksize: int = 64) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Process many independent notes across worker processes
+        
+        The pipeline is sent to each worker once, so compiled processor state is
+        reused for every note that worker handles. Processors that keep per-note
+        state for the caller (e.g. NoteSplitter's split notes) should use process().
+        Processors are closed when the notes are done (in a worker, after each chunk).
+        
+        Args:
+            items: (content, metadata, context) tuples
+            max_workers: Worker process count (None = CPU count, 1 = run in this process)
+            chunksize: Notes sent to a worker per batch
+            
+        Returns:
+            List of (processed_content, processed_metadata) in input order
+        """
+        items = list(items)
+        if max_workers == 1 or len(items) < 2:
+            try:
+                return [self.process(content, metadata, context) for content, metadata, context in items]
+            finally:
+                self.close()
+        
+        # Imported here: concurrent.futures.process pulls in multiprocessing, which most runs never use
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as executor:
+            return [result for chunk in executor.map(_process_chunk_in_worker, chunks) for result in chunk]
+    
+    def __getstate__(self):
+        # The safe wrappers are closures and can't be pickled; workers rebuild them
+        state = self.__dict__.copy()
+        del state['_safe_processors']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rebuild_safe_processors()
+    
+    @staticmethod
+    def _make_safe(processor: ContentProcessor) -> Callable:
+        """Wrap a processor so a failure is reported and its input passed through unchanged"""
+        def safe_process(content: str, metadata: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+            try:
+                return processor.process(content, metadata, context)
             except Exception as e:
                 print(f"Warning: Processor {processor.name} failed: {e}")
                 # Continue with other processors
-                continue
-        
-        return current_content, current_metadata
+                return content, metadata
+        return safe_process
     
     def get_default_pipeline(self) -> 'EditorPipeline':
         """Create a pipeline with default processors"""
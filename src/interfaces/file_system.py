@@ -5,8 +5,10 @@ Provides an abstraction layer for file system operations to enable testing
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, BinaryIO, Iterable, Tuple, Union
+import io
 import json
+import os
 
 
 class FileSystemInterface(ABC):
@@ -27,6 +29,34 @@ class FileSystemInterface(ABC):
         """Write text content to a file"""
         pass
     
+    def open_binary(self, path: Path) -> BinaryIO:
+        """Open a file for streaming binary reads; this default reads the whole file as UTF-8 text"""
+        return io.BytesIO(self.read_text(path).encode('utf-8'))
+    
+    def write_parts(self, path: Path, parts: Iterable[str], encoding: str = 'utf-8') -> None:
+        """Write a file from consecutive text pieces without joining them first"""
+        self.write_text(path, ''.join(parts), encoding)
+    
+    def write_many(self, items: Iterable[Tuple[Path, Union[str, Iterable[str]]]],
+                   encoding: str = 'utf-8') -> List[Optional[Exception]]:
+        """
+        Write several files, returning None or the raised exception for each item in order
+        
+        Content is a string or a sequence of pieces (see write_parts). Implementations
+        may overlap the writes; this default writes them one by one.
+        """
+        errors = []
+        for path, content in items:
+            try:
+                if isinstance(content, str):
+                    self.write_text(path, content, encoding)
+                else:
+                    self.write_parts(path, content, encoding)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+    
     @abstractmethod
     def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
         """Create a directory"""
@@ -55,15 +85,60 @@ class RealFileSystem(FileSystemInterface):
         return path.exists()
     
     def read_text(self, path: Path, encoding: str = 'utf-8') -> str:
-        return path.read_text(encoding=encoding)
+        # Decode the whole file in one pass rather than through TextIOWrapper;
+        # newline translation only runs when the file contains carriage returns
+        text = path.read_bytes().decode(encoding)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    
+    def open_binary(self, path: Path) -> BinaryIO:
+        return path.open('rb')
     
     def write_text(self, path: Path, content: str, encoding: str = 'utf-8') -> None:
         path.write_text(content, encoding=encoding)
     
+    def write_parts(self, path: Path, parts: Iterable[str], encoding: str = 'utf-8') -> None:
+        # Each piece is encoded into a 64 KiB buffer as it's written; no joined copy of the file
+        with open(path, 'w', encoding=encoding, buffering=1 << 16) as f:
+            f.writelines(parts)
+    
+    def write_many(self, items: Iterable[Tuple[Path, Union[str, Iterable[str]]]],
+                   encoding: str = 'utf-8') -> List[Optional[Exception]]:
+        # File writes release the GIL, so a thread pool overlaps the open/write/close syscalls
+        def write_one(item: Tuple[Path, Union[str, Iterable[str]]]) -> Optional[Exception]:
+            path, content = item
+            try:
+                if isinstance(content, str):
+                    self.write_text(path, content, encoding)
+                else:
+                    self.write_parts(path, content, encoding)
+            except Exception as e:
+                return e
+            return None
+        
+        items = list(items)
+        if len(items) < 2:
+            return [write_one(item) for item in items]
+        # Imported here: concurrent.futures (with logging) is only needed once there is a batch to write
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(items))) as executor:
+            return list(executor.map(write_one, items))
+    
     def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
         path.mkdir(parents=parents, exist_ok=exist_ok)
     
     def glob(self, path: Path, pattern: str) -> List[Path]:
+        # Fast path for simple "*.ext" patterns: one scandir pass with a suffix
+        # check instead of pathlib's fnmatch-per-entry matching
+        suffix = pattern[1:]
+        if pattern.startswith('*') and suffix and not any(c in suffix for c in '*?[/\\'):
+            suffix = os.path.normcase(suffix)
+            try:
+                with os.scandir(path) as entries:
+                    return [Path(e.path) for e in entries if os.path.normcase(e.name).endswith(suffix)]
+            except (FileNotFoundError, NotADirectoryError):
+                return []  # Match Path.glob, which yields nothing for a missing directory
         return list(path.glob(pattern))
     
     def is_file(self, path: Path) -> bool:
@@ -79,10 +154,18 @@ class MockFileSystem(FileSystemInterface):
     def __init__(self):
         self.files: Dict[str, str] = {}  # path -> content
         self.directories: set = set()
+        # directory -> file paths anywhere beneath it (dict used as an ordered set)
+        self._files_by_dir: Dict[str, Dict[str, None]] = {}
     
     def _normalize_path(self, path: Path) -> str:
         """Normalize path for consistent storage"""
         return str(path).replace('\\', '/')
+    
+    def _index_file(self, path_str: str) -> None:
+        """Register a file under each of its ancestor directories for glob lookups"""
+        parts = path_str.split('/')
+        for depth in range(1, len(parts)):
+            self._files_by_dir.setdefault('/'.join(parts[:depth]), {})[path_str] = None
         
     def exists(self, path: Path) -> bool:
         path_str = self._normalize_path(path)
@@ -99,7 +182,9 @@ class MockFileSystem(FileSystemInterface):
         parent_path = self._normalize_path(path.parent)
         if parent_path != self._normalize_path(path):  # Not root
             self.directories.add(parent_path)
-        self.files[self._normalize_path(path)] = content
+        path_str = self._normalize_path(path)
+        self.files[path_str] = content
+        self._index_file(path_str)
     
     def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
         path_str = self._normalize_path(path)
@@ -126,23 +211,14 @@ class MockFileSystem(FileSystemInterface):
         import fnmatch
         path_str = self._normalize_path(path)
         
+        # Only files in the directory (or its subdirectories) are considered
         matches = []
-        for file_path_key in self.files.keys():
-            # Check if the file is in the specified directory
-            file_path_parts = file_path_key.split('/')
-            path_parts = path_str.split('/')
+        for file_path_key in self._files_by_dir.get(path_str, ()):
+            filename = file_path_key.rsplit('/', 1)[-1]  # Just the filename
             
-            # File must be in the directory (or subdirectory for **)
-            if len(file_path_parts) > len(path_parts):
-                # Check if file path starts with directory path
-                if file_path_parts[:len(path_parts)] == path_parts:
-                    # Get the filename relative to the search directory
-                    relative_parts = file_path_parts[len(path_parts):]
-                    filename = relative_parts[-1]  # Just the filename
-                    
-                    # Match against pattern
-                    if fnmatch.fnmatch(filename, pattern):
-                        matches.append(Path(file_path_key))  # Keep POSIX style for tests
+            # Match against pattern
+            if fnmatch.fnmatch(filename, pattern):
+                matches.append(Path(file_path_key))  # Keep POSIX style for tests
         
         return matches
     
@@ -157,6 +233,7 @@ class MockFileSystem(FileSystemInterface):
         path_obj = Path(path)
         normalized_path = self._normalize_path(path_obj)
         self.files[normalized_path] = content
+        self._index_file(normalized_path)
         # Ensure parent directories exist
         current = path_obj.parent
         while current != current.parent:  # Stop at root
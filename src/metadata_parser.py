@@ -5,12 +5,34 @@ Parses notes.json to extract metadata and create filename-to-metadata mapping
 
 import json
 from pathlib import Path
-from typing import Dict, Optional, Any
-from dateutil.parser import parse
+from typing import Dict, Iterable, Optional, Any, Union
 from datetime import datetime
 
 from .interfaces import FileSystemInterface, RealFileSystem
 
+try:
+    import ijson
+except ImportError:  # optional; without it notes.json is loaded in one piece
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # optional; the standard json module is used instead
+    orjson = None
+
+
+def _json_loads(json_content: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, keeping the standard module's behaviour"""
+    if orjson is not None:
+        try:
+            return orjson.loads(json_content)
+        except orjson.JSONDecodeError:
+            pass  # let json report the error, or accept what orjson rejects (e.g. NaN, huge ints)
+    return json.loads(json_content)
+
+# Invalid filename characters, each replaced by '_' in a single translate pass
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
 
 class MetadataParser:
     """Parses SimpleNote JSON export to extract metadata"""
@@ -27,29 +49,45 @@ class MetadataParser:
         Returns:
             Dict mapping filenames to metadata dictionaries
         """
-        return self.parse_from_content(self.file_system.read_text(self.json_path))
+        if ijson is None:
+            # Read raw bytes; the JSON decoder handles UTF-8 itself
+            with self.file_system.open_binary(self.json_path) as f:
+                return self.parse_from_content(f.read())
+        
+        # Stream one note at a time so large exports never sit fully in memory
+        with self.file_system.open_binary(self.json_path) as f:
+            try:
+                return self._add_notes(ijson.items(f, 'activeNotes.item'))
+            except ijson.JSONError as e:
+                # Surface the same error type as the json.loads path
+                raise json.JSONDecodeError(str(e), '', 0) from e
     
-    def parse_from_content(self, json_content: str) -> Dict[str, Dict[str, Any]]:
+    def parse_from_content(self, json_content: Union[str, bytes]) -> Dict[str, Dict[str, Any]]:
         """
         Parse JSON content and return filename-to-metadata mapping
         
         Args:
-            json_content: JSON content as string
+            json_content: JSON content as string or UTF-8 bytes
             
         Returns:
             Dict mapping filenames to metadata dictionaries
         """
-        data = json.loads(json_content)
+        data = _json_loads(json_content)
             
         # Extract activeNotes array
-        notes = data.get('activeNotes', [])
-        
+        return self._add_notes(data.get('activeNotes', []))
+    
+    def _add_notes(self, notes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Add metadata for each note to the filename mapping"""
+        # Collected separately so a parse error part-way through a stream leaves the map untouched
+        parsed = {}
         for note in notes:
             metadata = self._extract_metadata(note)
             filename = self._generate_filename(note.get('content', ''))
             if filename:
-                self.metadata_map[filename] = metadata
-                
+                parsed[filename] = metadata
+        
+        self.metadata_map.update(parsed)
         return self.metadata_map
     
     def _extract_metadata(self, note: Dict[str, Any]) -> Dict[str, Any]:
@@ -71,7 +109,15 @@ class MetadataParser:
         if not timestamp_str:
             return None
             
+        # SimpleNote exports ISO-8601, which fromisoformat handles (including 'Z') far faster than dateutil
         try:
+            return datetime.fromisoformat(timestamp_str)
+        except (ValueError, TypeError):
+            pass
+        
+        try:
+            # Imported on first use: ISO exports never need dateutil, and it is slow to import
+            from dateutil.parser import parse
             return parse(timestamp_str)
         except Exception as e:
             print(f"Warning: Could not parse timestamp '{timestamp_str}': {e}")
@@ -101,13 +147,8 @@ class MetadataParser:
     
     def _sanitize_filename(self, title: str) -> str:
         """Sanitize title for use as filename"""
-        # Replace invalid filename characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            title = title.replace(char, '_')
-            
-        # Limit length and strip whitespace
-        title = title.strip()[:100]  # Reasonable filename length
+        # Replace invalid filename characters, limit length and strip whitespace
+        title = title.translate(_SANITIZE_TABLE).strip()[:100]  # Reasonable filename length
         
         return title if title else 'untitled'
     
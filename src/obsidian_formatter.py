@@ -4,20 +4,106 @@ Formats notes for Obsidian with YAML frontmatter and proper markdown structure
 Phase 2: Enhanced with folder organization support
 """
 
+import json
+import re
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
 from .interfaces import FileSystemInterface, RealFileSystem
 
+# libyaml's emitter is several times faster; fall back to the pure-Python one without it
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+# Strings that can be written as plain YAML scalars, provided YAML doesn't resolve them to another type
+_PLAIN_SCALAR_RE = re.compile(r'\w(?:[\w .\-/]*[\w.\-/])?')
+_IMPLICIT_RESOLVERS = yaml.resolver.Resolver.yaml_implicit_resolvers
+_TIMESTAMP_TAG = 'tag:yaml.org,2002:timestamp'
+_ISO_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}T[\d:.+\-Z]+')
+
+# An ISO timestamp yaml.dump wrapped in single quotes
+_QUOTED_ISO_TIMESTAMP_RE = re.compile(r"'(\d{4}-\d{2}-\d{2}T[^']+)'")
+
+# Characters JSON leaves raw that YAML double-quoted scalars can't hold raw (non-printable or line breaks)
+_YAML_UNSAFE_RE = re.compile('[\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff\ud800-\udfff]')
+
+# Invalid filename characters become '_' and brackets (wikilink syntax in Obsidian) become parentheses
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_') | {'[': '(', ']': ')'})
+
+
+def _implicit_tag(value: str) -> Optional[str]:
+    """Return the tag YAML would resolve an unquoted value to, or None for a plain string"""
+    for tag, regexp in _IMPLICIT_RESOLVERS.get(value[:1], ()):
+        if regexp.match(value):
+            return tag
+    return None
+
+
+def _yaml_json(value: Any, **kwargs) -> str:
+    """JSON for value that is also valid YAML: characters YAML can't hold raw are \\u-escaped"""
+    return _YAML_UNSAFE_RE.sub(lambda m: f'\\u{ord(m.group()):04x}', json.dumps(value, ensure_ascii=False, **kwargs))
+
+
+def _yaml_scalar(value: Any) -> Optional[str]:
+    """Render a frontmatter value as a YAML scalar, or None if it needs the full dumper"""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if type(value) is not str:
+        return None
+    
+    tag = _implicit_tag(value) if value else 'null'
+    if tag is None and _PLAIN_SCALAR_RE.fullmatch(value):
+        return value
+    if tag == _TIMESTAMP_TAG and _ISO_TIMESTAMP_RE.fullmatch(value):
+        return value  # ISO timestamps stay unquoted so they read back as dates
+    # JSON strings are valid YAML double-quoted scalars once YAML-unsafe characters are escaped
+    return _yaml_json(value)
+
+
+def _emit_frontmatter(frontmatter: Dict[str, Any]) -> Optional[str]:
+    """Write a flat frontmatter dict (scalars and string lists) directly, or None if unsupported"""
+    lines = []
+    for key, value in frontmatter.items():
+        if isinstance(value, list):
+            if not value:
+                lines.append(f'{key}: []\n')
+                continue
+            lines.append(f'{key}:\n')
+            for item in value:
+                item = _yaml_scalar(item)
+                if item is None:
+                    return None
+                lines.append(f'- {item}\n')
+            continue
+        
+        scalar = _yaml_scalar(value)
+        if scalar is None:
+            return None
+        lines.append(f'{key}: {scalar}\n')
+    return ''.join(lines)
+
 
 class ObsidianFormatter:
     """Formats notes for Obsidian vault with YAML frontmatter"""
     
-    def __init__(self, output_directory: Path, file_system: Optional[FileSystemInterface] = None):
+    def __init__(self, output_directory: Path, file_system: Optional[FileSystemInterface] = None,
+                 fast_frontmatter: bool = True, frontmatter_format: str = 'yaml'):
         self.output_directory = Path(output_directory)
         self.file_system = file_system or RealFileSystem()
+        # Write simple frontmatter directly instead of through yaml.dump
+        self.fast_frontmatter = fast_frontmatter
+        # 'json' writes frontmatter as a JSON object, which YAML (and Obsidian) read as a flow mapping
+        self.frontmatter_format = frontmatter_format
+        # Output directory -> casefolded note filenames known to be taken there
+        self._used_names: Dict[Path, Set[str]] = {}
+        self._used_names_lock = threading.Lock()
         try:
             self.file_system.mkdir(self.output_directory, parents=True, exist_ok=True)
         except Exception:
@@ -35,18 +121,24 @@ class ObsidianFormatter:
         Returns:
             Formatted note content with frontmatter
         """
+        return ''.join(self._format_note_parts(note_data, metadata))
+    
+    def _format_note_parts(self, note_data: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Formatted note as consecutive pieces, so it can be written without joining"""
         frontmatter = self._create_frontmatter(note_data, metadata)
         content = note_data.get('content', '')
         
         # Combine frontmatter and content
-        # Use default_flow_style=False but prevent quoting ISO datetimes
-        yaml_str = yaml.dump(frontmatter, default_flow_style=False, allow_unicode=True)
-        # De-quote ISO timestamps for tests/readability
-        import re as _re
-        yaml_str = _re.sub(r"'(\d{4}-\d{2}-\d{2}T[^']+)'", r"\1", yaml_str)
-        formatted_note = f"---\n{yaml_str}---\n\n{content}"
-        
-        return formatted_note
+        if self.frontmatter_format == 'json':
+            return ['---\n', _yaml_json(frontmatter, indent=2, default=str), '\n---\n\n', content]
+        
+        yaml_str = _emit_frontmatter(frontmatter) if self.fast_frontmatter else None
+        if yaml_str is None:
+            # Use default_flow_style=False but prevent quoting ISO datetimes; keys stay in frontmatter order
+            yaml_str = yaml.dump(frontmatter, Dumper=_Dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            # De-quote ISO timestamps for tests/readability
+            yaml_str = _QUOTED_ISO_TIMESTAMP_RE.sub(r"\1", yaml_str)
+        return ['---\n', yaml_str, '---\n\n', content]
     
     def _create_frontmatter(self, note_data: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Create YAML frontmatter dictionary"""
@@ -85,18 +177,8 @@ class ObsidianFormatter:
     
     def _sanitize_filename(self, title: str) -> str:
         """Sanitize title for use as Obsidian filename"""
-        # Replace invalid filename characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            title = title.replace(char, '_')
-            
-        # Replace other problematic characters for Obsidian
-        title = title.replace('[', '(').replace(']', ')')
-        
-        # Ensure unicode is preserved (allow_unicode in YAML handles rendering)
-        
-        # Limit length and strip whitespace
-        title = title.strip()[:100]
+        # Replace invalid and Obsidian-problematic characters in one pass, limit length and strip whitespace
+        title = title.translate(_SANITIZE_TABLE).strip()[:100]
         
         return title if title else 'untitled'
     
@@ -114,7 +196,8 @@ class ObsidianFormatter:
         safe_title = self._sanitize_filename(title)
         return f"{safe_title}.md"
     
-    def save_note(self, note_data: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Path:
+    def save_note(self, note_data: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None,
+                  output_dir: Optional[Path] = None) -> Path:
         """
         Format and save a note to the output directory
         Phase 2: Enhanced with folder organization support
@@ -122,34 +205,62 @@ class ObsidianFormatter:
         Args:
             note_data: Note content and info
             metadata: Optional metadata
+            output_dir: Already created folder to save into (skips resolving it from metadata)
             
         Returns:
             Path to the saved file
         """
-        formatted_content = self.format_note(note_data, metadata)
-        filename = self.generate_filename(note_data)
-        
-        # Determine output directory (Phase 2: folder organization)
-        folder_path = metadata.get('_folder_path', '') if metadata else ''
-        if folder_path:
-            output_dir = self.output_directory / folder_path
-            self.file_system.mkdir(output_dir, parents=True, exist_ok=True)
-        else:
-            output_dir = self.output_directory
-        
-        # Handle filename conflicts
-        output_path = output_dir / filename
-        counter = 1
-        while self.file_system.exists(output_path):
-            name_part = filename.rsplit('.md', 1)[0]
-            output_path = output_dir / f"{name_part}_{counter}.md"
-            counter += 1
+        output_path, note_parts = self._prepare_note(note_data, metadata, output_dir=output_dir)
             
         # Write the file
-        self.file_system.write_text(output_path, formatted_content)
+        self.file_system.write_parts(output_path, note_parts)
             
         return output_path
     
+    def _prepare_note(self, note_data: Dict[str, Any], metadata: Optional[Dict[str, Any]],
+                      output_dir: Optional[Path] = None) -> Tuple[Path, List[str]]:
+        """Format a note (as pieces) and claim a free output path for it"""
+        note_parts = self._format_note_parts(note_data, metadata)
+        filename = self.generate_filename(note_data)
+        
+        if output_dir is None:
+            output_dir = self._create_output_dir(metadata.get('_folder_path', '') if metadata else '')
+        
+        return self._claim_output_path(output_dir, filename), note_parts
+    
+    def _claim_output_path(self, output_dir: Path, filename: str) -> Path:
+        """Pick a free path for filename in output_dir, adding _1, _2, ... on conflicts"""
+        # Locked so concurrent save_note calls never claim the same name
+        with self._used_names_lock:
+            used = self._used_names.get(output_dir)
+            if used is None:
+                # One directory listing instead of an exists() probe per candidate name
+                used = {path.name.casefold() for path in self.file_system.glob(output_dir, '*.md') if path.parent == output_dir}
+                self._used_names[output_dir] = used
+            
+            # Handle filename conflicts; names compare casefolded so "Foo.md" and "foo.md" don't
+            # overwrite each other on case-insensitive file systems (macOS, Windows), and exists()
+            # still catches files created since the listing
+            candidate = filename
+            counter = 1
+            while candidate.casefold() in used or self.file_system.exists(output_dir / candidate):
+                used.add(candidate.casefold())
+                name_part = filename.rsplit('.md', 1)[0]
+                candidate = f"{name_part}_{counter}.md"
+                counter += 1
+            
+            used.add(candidate.casefold())
+        return output_dir / candidate
+    
+    def _create_output_dir(self, folder_path: str) -> Path:
+        """Return (creating if needed) the output directory for a note's folder path"""
+        # Phase 2: folder organization
+        if not folder_path:
+            return self.output_directory
+        output_dir = self.output_directory / folder_path
+        self.file_system.mkdir(output_dir, parents=True, exist_ok=True)
+        return output_dir
+    
     def save_all_notes(self, notes: list, metadata_map: Dict[str, Dict[str, Any]]) -> Dict[str, Path]:
         """
         Save all notes to the output directory
@@ -165,15 +276,35 @@ class ObsidianFormatter:
         
         print(f"Saving {len(notes)} notes to {self.output_directory}")
         
+        # Format everything first (output paths are claimed as they are chosen, so notes
+        # in this batch don't collide), then write all files in one batch
+        prepared = []
+        output_dirs = {}  # folder path -> created directory, so each folder is made once
         for note_data in notes:
             original_filename = note_data.get('filename', '')
             metadata = metadata_map.get(original_filename)
             
             try:
-                output_path = self.save_note(note_data, metadata)
+                folder_path = metadata.get('_folder_path', '') if metadata else ''
+                output_dir = output_dirs.get(folder_path)
+                if output_dir is None:
+                    output_dir = output_dirs[folder_path] = self._create_output_dir(folder_path)
+                output_path, note_parts = self._prepare_note(note_data, metadata, output_dir)
+                prepared.append((original_filename, output_path, note_parts, None))
+            except Exception as e:
+                prepared.append((original_filename, None, None, e))
+        
+        write_errors = iter(self.file_system.write_many(
+            [(output_path, content) for _, output_path, content, error in prepared if error is None]
+        ))
+        
+        for original_filename, output_path, _, error in prepared:
+            if error is None:
+                error = next(write_errors)
+            if error is None:
                 saved_files[original_filename] = output_path
                 print(f"Saved: {original_filename} -> {output_path.name}")
-            except Exception as e:
-                print(f"Error saving {original_filename}: {e}")
+            else:
+                print(f"Error saving {original_filename}: {error}")
                 
         return saved_files
\ No newline at end of file
@@ -26,6 +26,10 @@ class ContentProcessor(ABC):
         """
         Process content and return modified content and metadata
         
+        Implementations must not mutate the metadata they receive; copy it
+        before making changes (or return it unchanged). The pipeline relies
+        on this instead of copying metadata for every processor.
+        
         Args:
             content: The note content
             metadata: Note metadata
@@ -36,6 +40,27 @@ class ContentProcessor(ABC):
         """
         pass
     
+    def prepare_batch(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> None:
+        """
+        Optional hook called with all notes before they are processed one by one
+        
+        Processors with slow per-note work (e.g. remote calls) can do it for the
+        whole batch up front. The default does nothing.
+        
+        Args:
+            items: (content, metadata, context) tuples as given to the pipeline
+        """
+        pass
+    
+    def close(self) -> None:
+        """
+        Optional hook called once the pipeline is done with a run of notes
+        
+        Processors that buffer work (e.g. cache writes) should finish it here.
+        The processor may still be used afterwards. The default does nothing.
+        """
+        pass
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -53,15 +78,19 @@ class ContentProcessor(ABC):
         Returns:
             True if processor should run, False otherwise
         """
+        # Unfiltered processors (the default pipeline) always run; skip building the tag set
+        if not self.disabled_tags and not self.enabled_tags:
+            return True
+        
         note_tags = set(metadata.get('tags', []))
         
         # Skip if note has any disabled tags
-        if self.disabled_tags and any(tag in note_tags for tag in self.disabled_tags):
+        if self.disabled_tags and not note_tags.isdisjoint(self.disabled_tags):
             return False
         
         # If enabled_tags is specified, note must have at least one enabled tag
         if self.enabled_tags:
-            return any(tag in note_tags for tag in self.enabled_tags)
+            return not note_tags.isdisjoint(self.enabled_tags)
         
         # If no tag restrictions, always process
         return True
\ No newline at end of file
@@ -5,12 +5,42 @@ Uses an LLM to assign a primary category to a note based on configured categorie
 
 import json
 import hashlib
+import http.client
 import os
-from typing import Dict, Any, List, Optional, Tuple
+import re
+import threading
+import urllib.request
+from base64 import b64encode
+from urllib.parse import unquote, urlsplit
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from .base_processor import ContentProcessor
 
+try:
+    import orjson
+except ImportError:  # optional; the standard json module is used instead
+    orjson = None
+
+# Buffered cache lines are written once this many have accumulated
+_CACHE_BUFFER_LINES = 256
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, falling back to json for what orjson rejects (e.g. NaN)"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode JSON straight to UTF-8 bytes (orjson when available)"""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode('utf-8')
+
 
 @dataclass
 class _ClassificationResult:
@@ -19,6 +49,7 @@ class _ClassificationResult:
     reasons: str
     suggestions: List[str]
     undecided: bool = False
+    from_keywords: bool = False  # settled by category keywords, not the provider
 
 
 class CategoryClassifier(ContentProcessor):
@@ -38,6 +69,24 @@ class CategoryClassifier(ContentProcessor):
         self.tail_chars = getattr(config, 'llm_tail_chars', 500)
         self.undecided_policy = getattr(config, 'undecided_policy', 'other')
         self.suggestions_count = getattr(config, 'suggestions_count', 3)
+        self.concurrency = getattr(config, 'llm_concurrency', 4)
+        self.batch_size = getattr(config, 'llm_batch_size', 1)
+        self.attach_diagnostics = getattr(config, 'llm_attach_diagnostics', True)
+
+        # Categories are fixed for the run; resolve them and their cache-key form once
+        self._categories = self._get_categories()
+        self._allowed_slugs = tuple(c['slug'] for c in self._categories)
+        self._allowed_slug_set = frozenset(self._allowed_slugs)
+        self._slugs_key = ','.join(sorted(self._allowed_slugs))
+        # Everything after the note text in the cache key is fixed for the run
+        self._cache_key_suffix = '\0'.join(['', self._slugs_key, self.provider, self.model or '']).encode('utf-8')
+        self._prompt_prefix = self._build_prompt_prefix(self._categories)
+        self._batch_prompt_prefix = self._build_prompt_prefix(self._categories, batch=True)
+        # Optional per-category keywords that settle obvious notes without an LLM call
+        self._keyword_rules = [
+            (re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, c['keywords'])) + r')(?!\w)', re.IGNORECASE), c['slug'])
+            for c in self._categories if c.get('keywords')
+        ]
 
         # Ensure cache directory exists if caching is enabled
         if self.cache_enabled:
@@ -45,6 +94,42 @@ class CategoryClassifier(ContentProcessor):
             if cache_dir and not os.path.exists(cache_dir):
                 os.makedirs(cache_dir, exist_ok=True)
 
+        # Cache records keyed in memory so lookups don't rescan the JSONL file
+        self._cache_index: Dict[str, _ClassificationResult] = {}
+        # Serializes cache appends from classify_batch worker threads
+        self._cache_lock = threading.Lock()
+        # Lines waiting to be appended to the cache file in one write (see _store_in_cache)
+        self._cache_buffer: List[bytes] = []
+        # Set when the cache file has entries keyed the old SHA-256 way (64 hex characters)
+        self._has_legacy_keys = False
+        if self.cache_enabled:
+            self._load_cache_index()
+            self._has_legacy_keys = any(len(key) == 64 for key in self._cache_index)
+
+        # Results fetched by classify_batch, by cache key, waiting for their process() call
+        self._prefetched: Dict[str, _ClassificationResult] = {}
+        # How many batched notes still have to read each prefetched result (notes can share text)
+        self._prefetch_refs: Dict[str, int] = {}
+        # Requests started by prepare_batch that are still running, by cache key
+        self._inflight: Dict[str, Future] = {}
+
+        # Keep-alive HTTP connection per thread, reused across provider calls
+        self._http = threading.local()
+
+    def __getstate__(self):
+        # Thread-local connections and locks can't be pickled (e.g. for EditorPipeline.process_many)
+        state = self.__dict__.copy()
+        del state['_http']
+        del state['_cache_lock']
+        state['_cache_buffer'] = []
+        state['_inflight'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._http = threading.local()
+        self._cache_lock = threading.Lock()
+
     @property
     def name(self) -> str:
         return "category_classifier"
@@ -53,43 +138,161 @@ class CategoryClassifier(ContentProcessor):
         if not self.should_process(metadata, context):
             return content, metadata
 
+        allowed_slugs = self._allowed_slugs
+        allowed_set = self._allowed_slug_set
+
         # Trim content to head/tail to control tokens
         trimmed = self._trim_text(content)
+        cache_key = self._cache_key(trimmed)
+        inflight = self._inflight.pop(cache_key, None)
+        if inflight is not None:
+            inflight.result()
 
-        categories = self._get_categories()
-        allowed_slugs = [c['slug'] for c in categories]
-
-        # Try cache
-        cache_key = self._cache_key(trimmed, allowed_slugs)
-        result = self._load_from_cache(cache_key)
+        # Batched results first (including keyword hits found by the batch), then
+        # keyword hits, which skip both the provider and the cache, then the cache
+        result = (self._take_prefetched(cache_key) or self._keyword_result(content)
+                  or self._load_from_cache(cache_key, trimmed))
 
         if result is None:
             # Call provider
-            result = self._classify_with_provider(trimmed, categories)
+            result = self._classify_with_provider(trimmed, self._categories)
             # Store in cache
             self._store_in_cache(cache_key, result, trimmed, allowed_slugs)
 
+        # Copy-on-write (see ContentProcessor.process): one dict built with the
+        # diagnostics (not saved in frontmatter by default) instead of copy-then-assign
+        if self.attach_diagnostics:
+            updated = {
+                **metadata,
+                '_category_confidence': result.confidence,
+                '_category_reasoning': result.reasons,
+                '_category_provider': 'keywords' if result.from_keywords else self.provider,
+                '_category_model': '' if result.from_keywords else self.model or '',
+            }
+        else:
+            updated = dict(metadata)
+
         # Apply undecided policy / confidence threshold
-        updated = metadata.copy()
-        if result.category_slug and not result.undecided and result.confidence >= self.min_conf and result.category_slug in allowed_slugs:
+        if result.category_slug and not result.undecided and result.confidence >= self.min_conf and result.category_slug in allowed_set:
             updated['category'] = result.category_slug
         else:
             if self.undecided_policy == 'other':
                 updated['category'] = 'other'
             elif self.undecided_policy == 'suggest':
                 # leave category unset, add suggestions
-                suggestions = [s for s in result.suggestions if s in allowed_slugs][: self.suggestions_count]
+                # Suggestions come straight from the model's JSON, so skip anything unhashable
+                suggestions = [s for s in result.suggestions if isinstance(s, str) and s in allowed_set][: self.suggestions_count]
                 if suggestions:
                     updated['_category_suggestions'] = suggestions
 
-        # Attach diagnostics (not saved in frontmatter by default)
-        updated['_category_confidence'] = result.confidence
-        updated['_category_reasoning'] = result.reasons
-        updated['_category_provider'] = self.provider
-        updated['_category_model'] = self.model or ''
-
         return content, updated
 
+    def prepare_batch(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> None:
+        # Don't wait: notes are processed while their requests run, and
+        # process() blocks only on a note whose result hasn't arrived yet
+        self._start_batch(items)
+
+    def classify_batch(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]], max_workers: Optional[int] = None) -> None:
+        """
+        Classify uncached notes concurrently so process() finds their results ready
+
+        Provider calls are network-bound, so overlapping them in threads turns
+        one round-trip per note into roughly one per max_workers notes
+        (default: the llm_concurrency setting). With llm_batch_size > 1, each
+        request also carries that many notes.
+        """
+        wait(self._start_batch(items, max_workers))
+
+    def _start_batch(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]], max_workers: Optional[int] = None) -> List[Future]:
+        """Submit provider requests for the uncached notes in items and return their futures"""
+        # Drop what earlier batches left for notes that were never processed (with
+        # caching on, their results are still in the cache index)
+        self._inflight = {key: future for key, future in self._inflight.items() if not future.done()}
+        self._prefetched = {key: result for key, result in self._prefetched.items() if key in self._inflight}
+        self._prefetch_refs = {key: refs for key, refs in self._prefetch_refs.items() if key in self._inflight}
+
+        pending = {}
+        for content, metadata, context in items:
+            if not self.should_process(metadata, context):
+                continue
+            trimmed = self._trim_text(content)
+            key = self._cache_key(trimmed)
+            if key in pending or key in self._prefetched or key in self._inflight:
+                # Same text as a note already being fetched; it reads that result too
+                self._prefetch_refs[key] = self._prefetch_refs.get(key, 0) + 1
+            else:
+                keyword_result = self._keyword_result(content)
+                if keyword_result is not None:
+                    # No request needed; process() picks this up like any prefetched result
+                    self._prefetched[key] = keyword_result
+                    self._prefetch_refs[key] = 1
+                elif self._load_from_cache(key, trimmed) is None:
+                    pending[key] = trimmed
+                    self._prefetch_refs[key] = 1
+        if not pending:
+            return []
+
+        keys = list(pending)
+        size = max(1, self.batch_size)
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+
+        # Keep-alive connections opened by the pool threads, closed after the batch's last request
+        batch_connections = set()
+        remaining = [len(chunks)]
+        remaining_lock = threading.Lock()
+
+        def classify_chunk(chunk: List[str]) -> None:
+            try:
+                results = self._classify_many_with_provider([pending[key] for key in chunk], self._categories)
+            except Exception:
+                results = [None] * len(chunk)
+            # Stored as each request finishes, so an interrupted run keeps what it paid for
+            for key, result in zip(chunk, results):
+                if result is not None:
+                    self._prefetched[key] = result
+                    self._store_in_cache(key, result, pending[key], self._allowed_slugs)
+                else:
+                    # Nothing to read; process() will try this note again
+                    self._prefetch_refs.pop(key, None)
+
+        def classify(chunk: List[str]) -> None:
+            try:
+                classify_chunk(chunk)
+            finally:
+                conn = getattr(self._http, 'conn', None)
+                with remaining_lock:
+                    if conn is not None:
+                        batch_connections.add(conn)
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    # One cache append for everything the batch fetched
+                    self.flush_cache()
+                    for conn in batch_connections:
+                        conn.close()
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.concurrency)
+        futures = []
+        for chunk in chunks:
+            future = executor.submit(classify, chunk)
+            futures.append(future)
+            for key in chunk:
+                self._inflight[key] = future
+        # Submitted requests still run to completion; the threads exit when done
+        executor.shutdown(wait=False)
+        return futures
+
+    def _take_prefetched(self, key: str) -> Optional[_ClassificationResult]:
+        """A prefetched result, dropped once every batched note with this key has read it"""
+        result = self._prefetched.get(key)
+        if result is not None:
+            refs = self._prefetch_refs.pop(key, 1) - 1
+            if refs > 0:
+                self._prefetch_refs[key] = refs
+            else:
+                del self._prefetched[key]
+        return result
+
     def _trim_text(self, text: str) -> str:
         if len(text) <= self.head_chars + self.tail_chars:
             return text
@@ -97,51 +300,91 @@ class CategoryClassifier(ContentProcessor):
         tail = text[-self.tail_chars :] if self.tail_chars > 0 else ''
         return head + "\n\n...\n\n" + tail
 
+    def _keyword_result(self, content: str) -> Optional[_ClassificationResult]:
+        """Classify from keywords when the note's head matches exactly one category's list, else None"""
+        if not self._keyword_rules:
+            return None
+        head = content[:self.head_chars]
+        slugs = {slug for pattern, slug in self._keyword_rules if pattern.search(head)}
+        if len(slugs) != 1:
+            return None
+        return _ClassificationResult(category_slug=slugs.pop(), confidence=1.0, reasons='Matched category keywords', suggestions=[], from_keywords=True)
+
     def _get_categories(self) -> List[Dict[str, str]]:
-        cats = getattr(self.config, 'categories', []) or []
+        # Copied so adding 'other' doesn't modify the config's list
+        cats = list(getattr(self.config, 'categories', []) or [])
         # ensure 'other' exists
         slugs = [c.get('slug') for c in cats]
         if 'other' not in slugs:
             cats.append({"name": "Other", "slug": "other", "description": "Fallback category."})
         return cats
 
-    def _cache_key(self, trimmed_text: str, allowed_slugs: List[str]) -> str:
+    def _cache_key(self, trimmed_text: str) -> str:
+        # Dedup key only, not security: a 128-bit BLAKE2b fed piecewise, NUL-separated
+        h = hashlib.blake2b(trimmed_text.encode('utf-8'), digest_size=16)
+        h.update(self._cache_key_suffix)
+        return h.hexdigest()
+
+    def _legacy_cache_key(self, trimmed_text: str) -> str:
+        """The SHA-256 key used before _cache_key switched to BLAKE2b, to keep old caches usable"""
         key_input = json.dumps({
             'text': trimmed_text,
-            'slugs': sorted(allowed_slugs),
+            'slugs': sorted(self._allowed_slugs),
             'provider': self.provider,
             'model': self.model or ''
         }, sort_keys=True)
         return hashlib.sha256(key_input.encode('utf-8')).hexdigest()
 
-    def _load_from_cache(self, key: str) -> Optional[_ClassificationResult]:
-        if not self.cache_enabled or not os.path.exists(self.cache_path):
-            return None
+    def _load_cache_index(self) -> None:
+        """Read every cached record into the in-memory index (first record per key wins)"""
+        if not os.path.exists(self.cache_path):
+            return
         try:
-            with open(self.cache_path, 'r', encoding='utf-8') as f:
+            with open(self.cache_path, 'rb') as f:
                 for line in f:
+                    # Blank or truncated lines can't be records; skip them before paying for a parse
+                    if not line.startswith(b'{'):
+                        continue
                     try:
-                        rec = json.loads(line)
-                        if rec.get('key') == key:
-                            return _ClassificationResult(
-                                category_slug=rec.get('result', {}).get('category_slug'),
-                                confidence=rec.get('result', {}).get('confidence', 0.0),
-                                reasons=rec.get('result', {}).get('reasons', ''),
-                                suggestions=rec.get('result', {}).get('suggestions', []),
-                                undecided=rec.get('result', {}).get('undecided', False),
-                            )
+                        rec = _json_loads(line)
+                        res = rec.get('result', {})
+                        self._cache_index.setdefault(rec['key'], _ClassificationResult(
+                            category_slug=res.get('category_slug'),
+                            confidence=res.get('confidence') or 0.0,
+                            reasons=res.get('reasons', ''),
+                            suggestions=res.get('suggestions', []),
+                            undecided=res.get('undecided', False),
+                        ))
                     except Exception:
                         continue
         except Exception:
+            return
+
+    def _load_from_cache(self, key: str, trimmed_text: Optional[str] = None) -> Optional[_ClassificationResult]:
+        if not self.cache_enabled:
             return None
-        return None
+        result = self._cache_index.get(key)
+        if result is None and self._has_legacy_keys and trimmed_text is not None:
+            result = self._cache_index.get(self._legacy_cache_key(trimmed_text))
+            if result is not None:
+                # Re-store under the current key so the next lookup is direct
+                self._store_in_cache(key, result, trimmed_text, self._allowed_slugs)
+        return result
 
     def _store_in_cache(self, key: str, result: _ClassificationResult, trimmed_text: str, allowed_slugs: List[str]) -> None:
+        """
+        Add a result to the index and the cache file
+
+        The line is buffered and appended with the next flush_cache() (at the end
+        of each classify_batch, or from close()) or once _CACHE_BUFFER_LINES lines
+        are waiting, instead of opening the file per note.
+        """
         if not self.cache_enabled:
             return
-        try:
-            with open(self.cache_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps({
+        with self._cache_lock:
+            self._cache_index.setdefault(key, result)
+            try:
+                record = {
                     'key': key,
                     'result': {
                         'category_slug': result.category_slug,
@@ -150,40 +393,125 @@ class CategoryClassifier(ContentProcessor):
                         'suggestions': result.suggestions,
                         'undecided': result.undecided,
                     }
-                }) + "\n")
+                }
+                self._cache_buffer.append(_json_dumps(record) + b"\n")
+            except Exception:
+                return
+            if len(self._cache_buffer) >= _CACHE_BUFFER_LINES:
+                self._write_cache_buffer()
+
+    def flush_cache(self) -> None:
+        """Append any buffered cache lines to the cache file"""
+        with self._cache_lock:
+            self._write_cache_buffer()
+
+    def close(self) -> None:
+        """Write buffered cache lines; called by the pipeline when a run (or a worker's chunk) ends"""
+        self.flush_cache()
+
+    def _write_cache_buffer(self) -> None:
+        # Caller holds _cache_lock
+        if not self._cache_buffer:
+            return
+        try:
+            with open(self.cache_path, 'ab') as f:
+                f.write(b''.join(self._cache_buffer))
         except Exception:
             pass
+        self._cache_buffer.clear()
 
-    def _classify_with_provider(self, text: str, categories: List[Dict[str, str]]) -> _ClassificationResult:
-        # Build prompt payload
+    @staticmethod
+    def _build_prompt_prefix(categories: List[Dict[str, str]], batch: bool = False) -> str:
+        """Prompt text that precedes the note(s): instructions, allowed slugs and descriptions"""
         allowed_slugs = [c['slug'] for c in categories]
         descriptions = {c['slug']: c.get('description', '') for c in categories}
-
-        user_prompt = (
-            "You are a strict JSON generator. Given the note text, classify it into exactly one of the allowed category slugs or 'other'.\n"
-            "Return ONLY a JSON object with fields: category_slug, confidence (0..1), reasons (short), suggestions (array of slugs).\n\n"
+        if batch:
+            instructions = (
+                "You are a strict JSON generator. Given the numbered notes, classify each into exactly one of the allowed category slugs or 'other'.\n"
+                "Return ONLY a JSON object with field results: an array with one object per note, with fields: "
+                "id (the note number), category_slug, confidence (0..1), reasons (short), suggestions (array of slugs).\n\n"
+            )
+        else:
+            instructions = (
+                "You are a strict JSON generator. Given the note text, classify it into exactly one of the allowed category slugs or 'other'.\n"
+                "Return ONLY a JSON object with fields: category_slug, confidence (0..1), reasons (short), suggestions (array of slugs).\n\n"
+            )
+        return (
+            instructions +
             f"Allowed slugs: {allowed_slugs}\n"
-            f"Descriptions: {descriptions}\n\n"
-            f"Text:\n{text}\n"
+            f"Descriptions: {descriptions}\n\n" +
+            ("" if batch else "Text:\n")
         )
 
+    def _classify_with_provider(self, text: str, categories: List[Dict[str, str]]) -> _ClassificationResult:
+        # Build prompt payload; the category part is prebuilt for the configured categories
+        allowed_slugs = [c['slug'] for c in categories]
+        prefix = self._prompt_prefix if categories is self._categories else self._build_prompt_prefix(categories)
+        user_prompt = f"{prefix}{text}\n"
+
         # Provider selection (OpenAI first; others can be added later)
         if self.provider == 'openai':
             return self._classify_openai(user_prompt, allowed_slugs)
         # Fallback: return undecided to be safe
         return _ClassificationResult(category_slug=None, confidence=0.0, reasons='Provider not implemented', suggestions=[], undecided=True)
 
+    def _classify_many_with_provider(self, texts: List[str], categories: List[Dict[str, str]]) -> List[Optional[_ClassificationResult]]:
+        """Classify several notes, in one request where the provider supports it"""
+        if len(texts) == 1 or self.provider != 'openai':
+            return [self._classify_with_provider(text, categories) for text in texts]
+
+        allowed_slugs = [c['slug'] for c in categories]
+        prefix = self._batch_prompt_prefix if categories is self._categories else self._build_prompt_prefix(categories, batch=True)
+        user_prompt = prefix + ''.join(f"Note {i}:\n{text}\n\n" for i, text in enumerate(texts, 1))
+        results = self._classify_openai_batch(user_prompt, len(texts), allowed_slugs)
+        # Notes the reply left out (or an unreadable reply) are classified one by one
+        return [
+            result if result is not None else self._classify_with_provider(text, categories)
+            for text, result in zip(texts, results)
+        ]
+
     def _classify_openai(self, user_prompt: str, allowed_slugs: List[str]) -> _ClassificationResult:
+        api_key, missing = self._openai_api_key(allowed_slugs)
+        if missing:
+            return missing
+        result_obj, error = self._openai_json(user_prompt, api_key)
+        if error:
+            return _ClassificationResult(category_slug=None, confidence=0.0, reasons=error, suggestions=[], undecided=True)
+        return self._result_from_json(result_obj, allowed_slugs)
+
+    def _classify_openai_batch(self, user_prompt: str, count: int, allowed_slugs: List[str]) -> List[Optional[_ClassificationResult]]:
+        """Results for notes 1..count of a batch prompt, None where the reply has no usable entry"""
+        api_key, missing = self._openai_api_key(allowed_slugs)
+        if missing:
+            return [missing] * count
+        reply, error = self._openai_json(user_prompt, api_key)
+        if error and error != 'Parse error':
+            return [_ClassificationResult(category_slug=None, confidence=0.0, reasons=error, suggestions=[], undecided=True)] * count
+
+        results: List[Optional[_ClassificationResult]] = [None] * count
+        entries = reply.get('results') if isinstance(reply, dict) else None
+        for entry in entries if isinstance(entries, list) else ():
+            try:
+                index = int(entry['id']) - 1
+            except Exception:
+                continue
+            if 0 <= index < count and results[index] is None:
+                result = self._result_from_json(entry, allowed_slugs)
+                if result.reasons != 'Parse error':
+                    results[index] = result
+        return results
+
+    def _openai_api_key(self, allowed_slugs: List[str]) -> Tuple[Optional[str], Optional[_ClassificationResult]]:
+        """Return (api_key, None), or (None, undecided result) when the key is not set"""
         # Resolve API key env var name from config
         api_env_name = self.api_keys.get('openai') or 'OPENAI_API_KEY'
         api_key = os.environ.get(api_env_name)
         if not api_key:
-            return _ClassificationResult(category_slug=None, confidence=0.0, reasons=f'Missing {api_env_name}', suggestions=allowed_slugs[:2], undecided=True)
-
-        import json as _json
-        import urllib.request as _req
-        import urllib.error as _err
+            return None, _ClassificationResult(category_slug=None, confidence=0.0, reasons=f'Missing {api_env_name}', suggestions=allowed_slugs[:2], undecided=True)
+        return api_key, None
 
+    def _openai_json(self, user_prompt: str, api_key: str) -> Tuple[Any, Optional[str]]:
+        """Send one chat completion; return (decoded JSON reply, None) or (None, error reason)"""
         url = (self.base_url or 'https://api.openai.com/v1') + '/chat/completions'
         model = self.model or 'gpt-4o-mini'
         payload = {
@@ -195,30 +523,104 @@ class CategoryClassifier(ContentProcessor):
             'temperature': 0.0,
             'response_format': { 'type': 'json_object' }
         }
-        data = _json.dumps(payload).encode('utf-8')
-        req = _req.Request(url, data=data, headers={
+        data = _json_dumps(payload)
+        headers = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
-        })
+        }
         try:
-            with _req.urlopen(req, timeout=getattr(self.config, 'llm_timeout_sec', 30)) as resp:
-                body = resp.read().decode('utf-8')
-        except _err.HTTPError as e:
-            return _ClassificationResult(category_slug=None, confidence=0.0, reasons=f'HTTP {e.code}', suggestions=[], undecided=True)
+            status, body = self._post(url, data, headers)
         except Exception as e:
-            return _ClassificationResult(category_slug=None, confidence=0.0, reasons=str(e), suggestions=[], undecided=True)
+            return None, str(e)
+        if status >= 400:
+            return None, f'HTTP {status}'
 
         try:
-            parsed = _json.loads(body)
-            content = parsed['choices'][0]['message']['content']
-            result_obj = _json.loads(content)
+            parsed = _json_loads(body)
+            return _json_loads(parsed['choices'][0]['message']['content']), None
+        except Exception:
+            return None, 'Parse error'
+
+    def _result_from_json(self, result_obj: Any, allowed_slugs: List[str]) -> _ClassificationResult:
+        """Build a result from one decoded classification object"""
+        try:
             cat = result_obj.get('category_slug')
             if cat not in allowed_slugs and cat != 'other':
                 cat = None
             conf = float(result_obj.get('confidence', 0.0))
             reasons = result_obj.get('reasons', '')
+            if not isinstance(reasons, str):
+                reasons = str(reasons)
+            # Keep only string slugs; a bare string here would otherwise be iterated per character
             suggestions = result_obj.get('suggestions', [])
+            suggestions = [s for s in suggestions if isinstance(s, str)] if isinstance(suggestions, list) else []
             undecided = cat is None or conf < self.min_conf
             return _ClassificationResult(category_slug=cat, confidence=conf, reasons=reasons, suggestions=suggestions, undecided=undecided)
         except Exception:
             return _ClassificationResult(category_slug=None, confidence=0.0, reasons='Parse error', suggestions=[], undecided=True)
+
+    def _post(self, url: str, data: bytes, headers: Dict[str, str]) -> Tuple[int, bytes]:
+        """POST over this thread's keep-alive connection, saving a TCP/TLS handshake per note"""
+        parts = urlsplit(url)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            # Through a plain-HTTP proxy the request line carries the full URL
+            proxy_headers = self._http.proxy_headers
+            try:
+                if proxy_headers is None:
+                    conn.request('POST', path, body=data, headers=headers)
+                else:
+                    conn.request('POST', url, body=data, headers={**headers, **proxy_headers})
+                resp = conn.getresponse()
+                return resp.status, resp.read()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                # The server may have closed the idle connection; retry once on a fresh one
+                conn.close()
+                self._http.conn = None
+                if attempt:
+                    raise
+            except Exception:
+                conn.close()
+                self._http.conn = None
+                raise
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """This thread's open connection to scheme://netloc, creating it if needed"""
+        conn = getattr(self._http, 'conn', None)
+        if conn is not None and self._http.target == (scheme, netloc):
+            return conn
+        if conn is not None:
+            conn.close()
+        timeout = getattr(self.config, 'llm_timeout_sec', 30)
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        proxy = self._proxy_for(scheme, netloc)
+        proxy_headers = None
+        if proxy is None:
+            conn = conn_class(netloc, timeout=timeout)
+        else:
+            # Same *_PROXY / NO_PROXY settings urlopen honours
+            proxy_parts = urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+            auth_headers = {}
+            if proxy_parts.username:
+                credentials = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password or '')}"
+                auth_headers['Proxy-Authorization'] = 'Basic ' + b64encode(credentials.encode('utf-8')).decode('ascii')
+            conn = conn_class(proxy_parts.hostname, proxy_parts.port or 80, timeout=timeout)
+            if scheme == 'https':
+                # CONNECT through the proxy, then TLS end to end with the API host
+                target = urlsplit('//' + netloc)
+                conn.set_tunnel(target.hostname, target.port, headers=auth_headers)
+            else:
+                proxy_headers = auth_headers
+        self._http.conn = conn
+        self._http.target = (scheme, netloc)
+        self._http.proxy_headers = proxy_headers
+        return conn
+
+    @staticmethod
+    def _proxy_for(scheme: str, netloc: str) -> Optional[str]:
+        """The proxy URL configured for scheme, or None when unset or netloc is in NO_PROXY"""
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(netloc):
+            return None
+        return proxy
@@ -7,6 +7,12 @@ import re
 from typing import Dict, Any, Optional, Tuple
 from .base_processor import ContentProcessor
 
+# Whitespace at the end of each line (never the newline itself)
+_TRAILING_WHITESPACE_RE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+# Once lines are right-stripped, more than 2 blank lines is a run of 4+ newlines
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{4,}')
+
 
 class ContentTransformer(ContentProcessor):
     """Processor for general content transformations"""
@@ -21,6 +27,7 @@ class ContentTransformer(ContentProcessor):
         """
         super().__init__(**kwargs)
         self.transformation_rules = transformation_rules or self._default_transformation_rules()
+        self._compile_rules()
     
     @property
     def name(self) -> str:
@@ -33,15 +40,25 @@ class ContentTransformer(ContentProcessor):
             
         transformed_content = content
         
+        # Rules may be extended after construction (e.g. custom_transformations); recompile if so
+        if self.transformation_rules != self._compiled_source:
+            self._compile_rules()
+        
         # Apply transformation rules
-        for pattern, replacement in self.transformation_rules.items():
-            transformed_content = re.sub(pattern, replacement, transformed_content, flags=re.MULTILINE)
+        for pattern, replacement in self._compiled_rules:
+            transformed_content = pattern.sub(replacement, transformed_content)
         
         # Clean up extra whitespace
         transformed_content = self._clean_whitespace(transformed_content)
         
         return transformed_content, metadata
     
+    def _compile_rules(self):
+        """Compile transformation rules once instead of on every note"""
+        self._compiled_source = dict(self.transformation_rules)
+        self._compiled_rules = [(re.compile(pattern, re.MULTILINE), replacement)
+                                for pattern, replacement in self.transformation_rules.items()]
+    
     def _default_transformation_rules(self) -> Dict[str, str]:
         """Default content transformation rules"""
         return {
@@ -61,19 +78,9 @@ class ContentTransformer(ContentProcessor):
     def _clean_whitespace(self, content: str) -> str:
         """Clean up whitespace in content"""
         # Remove trailing whitespace from lines
-        lines = [line.rstrip() for line in content.split('\n')]
-        
-        # Remove excessive blank lines (more than 2 consecutive)
-        cleaned_lines = []
-        blank_count = 0
+        content = _TRAILING_WHITESPACE_RE.sub('', content)
         
-        for line in lines:
-            if not line.strip():
-                blank_count += 1
-                if blank_count <= 2:  # Allow up to 2 blank lines
-                    cleaned_lines.append(line)
-            else:
-                blank_count = 0
-                cleaned_lines.append(line)
+        # Remove excessive blank lines (allow up to 2 consecutive)
+        content = _EXCESS_BLANK_LINES_RE.sub('\n\n\n', content)
         
-        return '\n'.join(cleaned_lines).strip()
\ No newline at end of file
+        return content.strip()
\ No newline at end of file
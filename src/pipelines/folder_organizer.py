@@ -3,11 +3,16 @@ Folder Organizer Processor
 Determines folder organization based on tags and content
 """
 
-import re
 from typing import Dict, Any, List, Optional, Tuple
 from .base_processor import ContentProcessor
 
 
+def _starts_with_date(filename: str) -> bool:
+    """Check for a leading MM-DD-YYYY date by position (same as matching \\d{2}-\\d{2}-\\d{4})"""
+    return (len(filename) >= 10 and filename[2] == '-' and filename[5] == '-'
+            and filename[0:2].isdecimal() and filename[3:5].isdecimal() and filename[6:10].isdecimal())
+
+
 class FolderOrganizer(ContentProcessor):
     """Processor that determines folder organization based on tags and content"""
     
@@ -40,11 +45,8 @@ class FolderOrganizer(ContentProcessor):
         else:
             folder_path = self._determine_folder(tags, content, context.get('filename', ''))
         
-        # Add folder info to context for the formatter
-        updated_metadata = metadata.copy()
-        updated_metadata['_folder_path'] = folder_path
-        
-        return content, updated_metadata
+        # Add folder info to context for the formatter (one dict, no copy-then-assign)
+        return content, {**metadata, '_folder_path': folder_path}
     
     def _default_organization_rules(self) -> Dict[str, str]:
         """Default folder organization rules"""
@@ -79,13 +81,14 @@ class FolderOrganizer(ContentProcessor):
     
     def _determine_folder(self, tags: List[str], content: str, filename: str) -> str:
         """Determine the appropriate folder based on tags, content, and filename"""
-        # Check for specific folder mappings based on tags
-        for tag in tags:
-            if tag in self.organization_rules:
-                return self.organization_rules[tag]
+        # Check for specific folder mappings based on tags (first mapped tag wins)
+        rules = self.organization_rules
+        folder = next((rules[tag] for tag in tags if tag in rules), None)
+        if folder is not None:
+            return folder
         
         # Check for journal entries (date-based filenames)
-        if re.match(r'\d{2}-\d{2}-\d{4}', filename):
+        if _starts_with_date(filename):
             return 'journal'
             
         # Check for reference notes (starting with #)
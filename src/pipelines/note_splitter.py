@@ -3,10 +3,12 @@ Note Splitter Processor
 Splits notes into separate files based on headers
 """
 
-import re
 from typing import Dict, Any, List, Optional, Tuple
 from .base_processor import ContentProcessor
 
+# Invalid filename characters and dashes become spaces, so one split() finds the words between them
+_HEADER_SEPARATOR_TABLE = str.maketrans({c: ' ' for c in '<>:"|?*/\\-'})
+
 
 class NoteSplitter(ContentProcessor):
     """Processor that splits notes into separate files based on headers"""
@@ -24,6 +26,9 @@ class NoteSplitter(ContentProcessor):
         self.enable_splitting = self.split_config.get('enable_note_splitting', False)
         self.split_header_level = self.split_config.get('split_header_level', 2)  # Default to ##
         self.preserve_main_header = self.split_config.get('preserve_main_header', True)
+        # A line starting with this is a header at exactly split_header_level
+        # (the space rules out deeper headers, which have another '#' there)
+        self._header_prefix = '#' * self.split_header_level + ' '
         self.split_notes = []  # Store split notes for later processing
     
     @property
@@ -53,9 +58,6 @@ class NoteSplitter(ContentProcessor):
         self.split_notes = []
         
         for i, (header, section_content) in enumerate(split_sections):
-            # Create metadata for split note
-            split_metadata = metadata.copy()
-            
             if i == 0 and self.preserve_main_header:
                 # Keep original filename for first section
                 split_filename = filename
@@ -65,15 +67,15 @@ class NoteSplitter(ContentProcessor):
                 split_filename = self._sanitize_header_filename(header)
                 split_title = header.strip('#').strip()
             
-            split_metadata['title'] = split_title
-            split_metadata['_split_from'] = filename
-            split_metadata['_split_index'] = i
+            # Create metadata for split note in one dict instead of copy-then-assign
+            split_metadata = {**metadata, 'title': split_title, '_split_from': filename, '_split_index': i}
             
             self.split_notes.append({
                 'filename': split_filename,
                 'content': section_content,
                 'metadata': split_metadata,
-                'context': context.copy()
+                # Shared, not copied: processors treat context as read-only
+                'context': context
             })
         
         # Return the first split section as the "main" note
@@ -85,28 +87,29 @@ class NoteSplitter(ContentProcessor):
     
     def _split_by_headers(self, content: str) -> List[Tuple[str, str]]:
         """Split content by markdown headers at the specified level"""
-        lines = content.split('\n')
+        header_prefix = self._header_prefix
+        
+        # Offsets of the header lines at our target level; sections are sliced
+        # straight from content between them instead of re-joining their lines
+        header_starts = [0] if content.startswith(header_prefix) else []
+        marker = '\n' + header_prefix
+        pos = content.find(marker)
+        while pos != -1:
+            header_starts.append(pos + 1)
+            pos = content.find(marker, pos + 1)
+        
         sections = []
-        current_section = []
-        current_header = ""
-        header_pattern = '#' * self.split_header_level + ' '
         
-        for line in lines:
-            # Check if this line is a header at our target level
-            if line.startswith(header_pattern) and not line.startswith('#' * (self.split_header_level + 1)):
-                # Save previous section if it exists
-                if current_section:
-                    sections.append((current_header, '\n'.join(current_section).strip()))
-                
-                # Start new section
-                current_header = line
-                current_section = [line]
-            else:
-                current_section.append(line)
+        # Text before the first header (or the whole note when there is none)
+        if not header_starts or header_starts[0] > 0:
+            end = header_starts[0] if header_starts else len(content)
+            sections.append(("", content[:end].strip()))
         
-        # Don't forget the last section
-        if current_section:
-            sections.append((current_header, '\n'.join(current_section).strip()))
+        for i, start in enumerate(header_starts):
+            end = header_starts[i + 1] if i + 1 < len(header_starts) else len(content)
+            line_end = content.find('\n', start, end)
+            header = content[start:line_end] if line_end != -1 else content[start:end]
+            sections.append((header, content[start:end].strip()))
         
         return sections
     
@@ -115,16 +118,9 @@ class NoteSplitter(ContentProcessor):
         # Remove markdown header symbols
         clean_title = header.strip('#').strip()
         
-        # Replace invalid filename characters
-        invalid_chars = ['<', '>', ':', '"', '|', '?', '*', '/', '\\']
-        for char in invalid_chars:
-            clean_title = clean_title.replace(char, '-')
-        
-        # Replace multiple spaces/dashes with single dash
-        clean_title = re.sub(r'[-\s]+', '-', clean_title)
-        
-        # Remove leading/trailing dashes
-        clean_title = clean_title.strip('-')
+        # Replace invalid filename characters and runs of spaces/dashes with a
+        # single dash, without leading/trailing dashes
+        clean_title = '-'.join(clean_title.translate(_HEADER_SEPARATOR_TABLE).split())
         
         # Ensure it's not empty
         if not clean_title:
@@ -4,9 +4,74 @@ Adds tags based on content analysis and filename patterns
 """
 
 import re
-from typing import Dict, Any, List, Optional, Tuple
+import sys
+from itertools import islice
+from typing import Dict, Any, List, Optional, Set, Tuple
 from .base_processor import ContentProcessor
 
+try:
+    import ahocorasick
+except ImportError:  # optional; literal rules then use a substring check per keyword
+    ahocorasick = None
+
+# Backreferences would point at the wrong group once a pattern is wrapped in the fused alternation
+_BACKREF_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+# MM-DD-YYYY date anywhere in a filename (journal entries)
+_DATE_RE = re.compile(r'\d{2}-\d{2}-\d{4}')
+
+# A "- ", "* " or "+ " bullet followed by text, or a "1." numbered item; never spans a newline
+_LIST_LINE_RE = re.compile(r'^[^\S\n]*(?:[-*+] [^\S\n]*\S|\d+\.[^\S\n])', re.MULTILINE)
+
+# Plain keyword alternations such as "cocktail|gin|rum" with no regex metacharacters
+_LITERAL_ALTERNATION_RE = re.compile(r'[\w -]+(?:\|[\w -]+)*', re.ASCII)
+
+
+def _literal_keywords(pattern: str) -> Optional[List[str]]:
+    """Return the lowercased keywords of a pure literal alternation rule, or None"""
+    body = pattern.removeprefix('(?i)')
+    if body.startswith('(') and body.endswith(')'):
+        body = body[1:-1]
+    if not _LITERAL_ALTERNATION_RE.fullmatch(body):
+        return None
+    return [keyword.lower() for keyword in body.split('|')]
+
+
+# Tokens of a simple pattern: an escape, a {m,n} quantifier, a run of literal characters, or any other character
+_PATTERN_TOKEN_RE = re.compile(r'\\.|\{[^}]*\}|[\w -]+|.', re.ASCII | re.DOTALL)
+_LITERAL_RUN_RE = re.compile(r'[\w -]+', re.ASCII)
+
+
+def _required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Return, for each alternative of a rule, a literal that any match must contain
+    
+    Only handles flat alternations (no groups or character classes); returns None
+    when some alternative has no required literal or the pattern is too complex.
+    """
+    body = pattern.removeprefix('(?i)')
+    if body.startswith('(') and body.endswith(')'):
+        body = body[1:-1]
+    if any(c in body for c in '()[]') or '\\|' in body:
+        return None
+    
+    literals = []
+    for alternative in body.split('|'):
+        tokens = _PATTERN_TOKEN_RE.findall(alternative)
+        longest = ''
+        for i, token in enumerate(tokens):
+            if not _LITERAL_RUN_RE.fullmatch(token):
+                continue
+            # A quantifier only applies to the last character, which may then be absent
+            if i + 1 < len(tokens) and tokens[i + 1][0] in '?*{':
+                token = token[:-1]
+            if len(token) > len(longest):
+                longest = token
+        if not longest:
+            return None
+        literals.append(longest)
+    return literals
+
 
 class TagInjector(ContentProcessor):
     """Processor that adds tags based on content analysis and filename patterns"""
@@ -23,6 +88,7 @@ class TagInjector(ContentProcessor):
         super().__init__(**kwargs)
         self.tag_rules = tag_rules or {}
         self.propagate_category_tag = propagate_category_tag
+        self._compile_rules()
     
     @property
     def name(self) -> str:
@@ -33,61 +99,141 @@ class TagInjector(ContentProcessor):
         if not self.should_process(metadata, context):
             return content, metadata
             
-        new_tags = set(metadata.get('tags', []))
+        # Interned so the same tag shares one string object across all notes
+        new_tags = {sys.intern(tag) if type(tag) is str else tag for tag in metadata.get('tags', [])}
         
         # Analyze filename for patterns
         filename = context.get('filename', '')
-        new_tags.update(self._extract_filename_tags(filename))
+        new_tags |= self._extract_filename_tags(filename)
         
         # Analyze content for patterns
-        new_tags.update(self._extract_content_tags(content))
+        new_tags |= self._extract_content_tags(content)
         
         # Category tag propagation
         category = metadata.get('category')
         if self.propagate_category_tag and category:
             new_tags.add(category)
         
-        # Update metadata
-        updated_metadata = metadata.copy()
-        updated_metadata['tags'] = sorted(list(new_tags))
+        # Update metadata (sorted() builds the one output list straight from the set)
+        return content, {**metadata, 'tags': sorted(new_tags)}
+    
+    def _compile_rules(self):
+        """Compile tag rules once, plus single-pass matchers used to pre-scan text"""
+        self._compiled_source = dict(self.tag_rules)
+        self._compiled_rules = [
+            (re.compile(pattern, re.IGNORECASE), tuple(sys.intern(tag) for tag in pattern_tags))
+            for pattern, pattern_tags in self.tag_rules.items()
+        ]
+        patterns = list(self.tag_rules)
+        
+        # Keyword-only rules skip the regex engine: one automaton pass with pyahocorasick,
+        # otherwise a substring check per keyword (case-insensitive regex scans are far slower)
+        self._automaton = None
+        self._keyword_rules = []
+        self._regex_indices = list(range(len(patterns)))
+        keyword_rules = {}
+        for i, pattern in enumerate(patterns):
+            for keyword in _literal_keywords(pattern) or ():
+                keyword_rules.setdefault(keyword, set()).add(i)
+        if keyword_rules:
+            if ahocorasick is not None:
+                self._automaton = ahocorasick.Automaton()
+                for keyword, rule_indices in keyword_rules.items():
+                    self._automaton.add_word(keyword, frozenset(rule_indices))
+                self._automaton.make_automaton()
+            else:
+                self._keyword_rules = [(keyword, frozenset(rule_indices)) for keyword, rule_indices in keyword_rules.items()]
+            literal_indices = set().union(*keyword_rules.values())
+            self._regex_indices = [i for i in self._regex_indices if i not in literal_indices]
+        
+        # Cheap literal scans that rule out a regex rule before running it (None = no prefilter)
+        self._prefilters = []
+        for pattern in patterns:
+            literals = None if _literal_keywords(pattern) else _required_literals(pattern)
+            self._prefilters.append(
+                re.compile('|'.join(map(re.escape, literals)), re.IGNORECASE) if literals else None
+            )
         
-        return content, updated_metadata
+        self._combined_re = None
+        regex_patterns = [(i, patterns[i]) for i in self._regex_indices]
+        if regex_patterns and not any(_BACKREF_RE.search(pattern) for _, pattern in regex_patterns):
+            try:
+                # The fused pattern is compiled IGNORECASE, so a leading (?i) is redundant and would be rejected mid-pattern
+                self._combined_re = re.compile(
+                    '|'.join(f'(?P<g{i}>{pattern.removeprefix("(?i)")})' for i, pattern in regex_patterns),
+                    re.IGNORECASE
+                )
+            except re.error:
+                # e.g. duplicate group names or inline flags across rules; use per-rule matching only
+                self._combined_re = None
+    
+    def _match_rules(self, text: str) -> Set[str]:
+        """Return the tags of every rule whose pattern matches somewhere in text"""
+        if self.tag_rules != self._compiled_source:
+            self._compile_rules()
+        
+        hit = set()
+        if self._automaton is not None:
+            for _, rule_indices in self._automaton.iter(text.lower()):
+                hit.update(rule_indices)
+        elif self._keyword_rules:
+            lowered = text.lower()
+            for keyword, rule_indices in self._keyword_rules:
+                if keyword in lowered:
+                    hit.update(rule_indices)
+        
+        if self._combined_re is None:
+            for i in self._regex_indices:
+                if self._rule_matches(i, text):
+                    hit.add(i)
+        else:
+            # One fused scan finds most hits; no fused match means no regex rule can match anywhere
+            fused_hit = {int(match.lastgroup[1:]) for match in self._combined_re.finditer(text)}
+            if fused_hit:
+                hit.update(fused_hit)
+                # Alternation reports one rule per position, so re-check the rules it didn't report
+                for i in self._regex_indices:
+                    if i not in hit and self._rule_matches(i, text):
+                        hit.add(i)
+        
+        tags = set()
+        for i in hit:
+            tags.update(self._compiled_rules[i][1])
+        return tags
+    
+    def _rule_matches(self, index: int, text: str) -> bool:
+        """Search text with one rule, skipping the regex when its required literals are absent"""
+        prefilter = self._prefilters[index]
+        if prefilter is not None and not prefilter.search(text):
+            return False
+        return self._compiled_rules[index][0].search(text) is not None
     
-    def _extract_filename_tags(self, filename: str) -> List[str]:
+    def _extract_filename_tags(self, filename: str) -> Set[str]:
         """Extract tags based on filename patterns"""
-        tags = []
+        tags = set()
         
         # Check for date patterns (journal entries)
-        if re.search(r'\d{2}-\d{2}-\d{4}', filename):
-            tags.append('journal')
+        if _DATE_RE.search(filename):
+            tags.add('journal')
             
         # Check for specific prefixes
         if filename.startswith('#'):
-            tags.append('reference')
+            tags.add('reference')
             
-        # Apply filename-specific rules
-        filename_lower = filename.lower()
-        for pattern, pattern_tags in self.tag_rules.items():
-            if re.search(pattern, filename_lower):
-                tags.extend(pattern_tags)
+        # Apply filename-specific rules (patterns are compiled case-insensitive)
+        tags |= self._match_rules(filename)
                 
         return tags
     
-    def _extract_content_tags(self, content: str) -> List[str]:
+    def _extract_content_tags(self, content: str) -> Set[str]:
         """Extract tags based on content analysis"""
-        tags = []
-        content_lower = content.lower()
+        tags = set()
         
-        # Apply content-specific rules
-        for pattern, pattern_tags in self.tag_rules.items():
-            if re.search(pattern, content_lower):
-                tags.extend(pattern_tags)
+        # Apply content-specific rules (patterns are compiled case-insensitive)
+        tags |= self._match_rules(content)
             
-        # Check for list patterns (might be reference lists)
-        lines = content.split('\n')
-        list_lines = sum(1 for line in lines if line.strip().startswith(('- ', '* ', '+ ')) or 
-                        re.match(r'^\s*\d+\.\s', line))
-        if list_lines > 3:  # More than 3 list items
-            tags.append('lists')
+        # Check for list patterns (might be reference lists); stops scanning at the fourth item
+        if len(list(islice(_LIST_LINE_RE.finditer(content), 4))) > 3:  # More than 3 list items
+            tags.add('lists')
             
         return tags
\ No newline at end of file
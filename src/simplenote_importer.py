@@ -40,7 +40,8 @@ class SimpleNoteImporter:
         
         # Initialize processors with dependency injection
         self.content_processor = ContentProcessor(self.notes_directory, self.file_system)
-        self.obsidian_formatter = ObsidianFormatter(self.output_directory, self.file_system)
+        self.obsidian_formatter = ObsidianFormatter(self.output_directory, self.file_system,
+                                                    frontmatter_format=self.config.frontmatter_format)
         self.metadata_parser = MetadataParser(self.json_path, self.file_system) if self.json_path else None
         
         # Initialize Phase 2 components
@@ -97,6 +98,7 @@ class SimpleNoteImporter:
                 processed_notes = []
                 total_split_notes = 0
                 
+                pipeline_inputs = []
                 for note in notes:
                     original_filename = note.get('filename', '')
                     # Try to get metadata by original filename; fallback to title-based key
@@ -112,6 +114,15 @@ class SimpleNoteImporter:
                         'original_path': note.get('original_path'),
                         'phase': 3 if self.config.enable_note_splitting else 2
                     }
+                    pipeline_inputs.append((note, original_metadata, context))
+                
+                # Batch work up front (e.g. LLM classification, which runs in the background while notes are processed)
+                self.editor_pipeline.prepare_batch(
+                    [(note['content'], original_metadata, context) for note, original_metadata, context in pipeline_inputs]
+                )
+                
+                for note, original_metadata, context in pipeline_inputs:
+                    original_filename = context['filename']
                     
                     # Apply pipeline
                     processed_content, processed_metadata = self.editor_pipeline.process(
@@ -181,6 +192,11 @@ class SimpleNoteImporter:
             import traceback
             traceback.print_exc()
             return {'success': False, 'total_files': 0, 'processed_files': 0, 'errors': 1}
+        
+        finally:
+            # Processors may buffer work (e.g. LLM cache writes) until the run ends
+            if self.editor_pipeline:
+                self.editor_pipeline.close()
     
     def _print_summary(self, notes: list, metadata_map: dict, saved_files: dict):
         """Print import summary"""
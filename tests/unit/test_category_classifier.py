@@ -6,10 +6,21 @@ from src.pipelines.tag_injector import TagInjector
 from src.pipelines.folder_organizer import FolderOrganizer
 
 
+_cache_path = None
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path):
+    # Keep each test's LLM cache under tmp_path, never the working tree's .cache/
+    global _cache_path
+    _cache_path = str(tmp_path / "llm_category.jsonl")
+
+
 def make_config(**overrides):
     cfg = ImportConfig()
     # Enable LLM categorization by default for these tests
     cfg.enable_llm_categorization = True
+    cfg.llm_cache_path = _cache_path
     for k, v in overrides.items():
         setattr(cfg, k, v)
     return cfg
@@ -68,6 +79,79 @@ def test_category_classifier_suggest_policy(monkeypatch):
     assert out_meta.get('_category_suggestions') == ['house', 'recipes']
 
 
+def test_category_classifier_suggest_policy_skips_unknown_suggestions(monkeypatch):
+    cfg = make_config(llm_cache_enabled=False, llm_min_confidence=0.9, undecided_policy='suggest')
+    clf = CategoryClassifier(config=cfg)
+    monkeypatch.setattr(clf, "_classify_with_provider",
+                        lambda text, categories: _ClassificationResult(None, 0.4, '', [{'slug': 'house'}, 'nope', 'gaming']))
+
+    _, out_meta = clf.process("text", {}, {"filename": "n.txt"})
+
+    assert out_meta.get('_category_suggestions') == ['gaming']
+
+
+def test_category_classifier_result_from_json_validates_fields():
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False))
+    slugs = list(clf._allowed_slugs)
+
+    result = clf._result_from_json({'category_slug': 'house', 'confidence': '0.8', 'reasons': ['x'], 'suggestions': 'house'}, slugs)
+    assert result.category_slug == 'house'
+    assert result.confidence == pytest.approx(0.8)
+    assert result.reasons == "['x']"
+    assert result.suggestions == []
+
+    result = clf._result_from_json({'category_slug': ['house'], 'suggestions': ['house', 3]}, slugs)
+    assert result.category_slug is None
+    assert result.suggestions == ['house']
+
+
+def test_category_classifier_keyword_fast_path(monkeypatch):
+    cats = [
+        {"name": "Recipes", "slug": "recipes", "keywords": ["#recipe", "tablespoon"]},
+        {"name": "Gaming", "slug": "gaming", "keywords": ["walkthrough"]},
+    ]
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False, categories=cats))
+    calls = []
+
+    def fake_provider(text, categories):
+        calls.append(text)
+        return _ClassificationResult(category_slug='gaming', confidence=0.9, reasons='', suggestions=[])
+
+    monkeypatch.setattr(clf, "_classify_with_provider", fake_provider)
+
+    _, out_meta = clf.process("Pancakes #Recipe\n2 tablespoons sugar", {}, {"filename": "n.txt"})
+    assert out_meta['category'] == 'recipes'
+    assert calls == []
+
+    # Keywords of two categories (or none) fall through to the LLM
+    _, out_meta = clf.process("recipe walkthrough, add a tablespoon", {}, {"filename": "n.txt"})
+    assert out_meta['category'] == 'gaming'
+    clf.process("tablespoons", {}, {"filename": "n.txt"})
+    assert len(calls) == 2
+
+
+def test_category_classifier_keyword_hits_in_batch(monkeypatch):
+    cats = [{"name": "Recipes", "slug": "recipes", "keywords": ["tablespoon"]}]
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False, categories=cats, llm_model='m'))
+    scans = []
+    keyword_result = clf._keyword_result
+
+    def counting_keyword_result(content):
+        scans.append(content)
+        return keyword_result(content)
+
+    monkeypatch.setattr(clf, "_keyword_result", counting_keyword_result)
+    monkeypatch.setattr(clf, "_classify_with_provider", lambda text, categories: pytest.fail("provider called"))
+
+    items = [("1 tablespoon sugar", {}, {"filename": "n.txt"})]
+    clf.prepare_batch(items)
+    _, out_meta = clf.process(*items[0])
+    assert out_meta['category'] == 'recipes'
+    assert out_meta['_category_provider'] == 'keywords'
+    assert out_meta['_category_model'] == ''
+    assert len(scans) == 1
+
+
 def test_category_classifier_truncation(monkeypatch):
     cfg = make_config(llm_head_chars=10, llm_tail_chars=5)
     cfg.llm_cache_enabled = False  # ensure provider is called
@@ -88,6 +172,451 @@ def test_category_classifier_truncation(monkeypatch):
     assert captured['text'] == expected
 
 
+def test_category_classifier_cache_reused_across_instances(monkeypatch, tmp_path):
+    cfg = make_config(llm_cache_path=str(tmp_path / "cache" / "llm.jsonl"))
+    calls = []
+
+    def fake_provider(text, categories):
+        calls.append(text)
+        return _ClassificationResult(category_slug='house', confidence=0.9, reasons='home', suggestions=[])
+
+    clf = CategoryClassifier(config=cfg)
+    monkeypatch.setattr(clf, "_classify_with_provider", fake_provider)
+    clf.process("water heater", {}, {"filename": "n.txt"})
+    clf.process("water heater", {}, {"filename": "n.txt"})
+    assert len(calls) == 1
+
+    # Appends are buffered until a flush (a batch ending, the threshold, or exit)
+    assert not (tmp_path / "cache" / "llm.jsonl").exists()
+    clf.flush_cache()
+
+    # A fresh instance picks the record up from the JSONL file
+    clf2 = CategoryClassifier(config=cfg)
+    monkeypatch.setattr(clf2, "_classify_with_provider", fake_provider)
+    _, out_meta = clf2.process("water heater", {}, {"filename": "n.txt"})
+    assert len(calls) == 1
+    assert out_meta.get('category') == 'house'
+
+
+def test_category_classifier_reads_existing_cache_lines(tmp_path):
+    cache_path = tmp_path / "llm.jsonl"
+    cache_path.write_text(
+        '{"key": "k1", "result": {"category_slug": "house", "confidence": 0.9, "reasons": "caf\\u00e9"}}\n'
+        '\n'
+        '{"key": "k2", "result": {"category_slug": "music", "confidence": NaN}}\n'
+        '{"key": "k3", "res\n',
+        encoding='utf-8'
+    )
+    clf = CategoryClassifier(config=make_config(llm_cache_path=str(cache_path)))
+
+    assert clf._load_from_cache("k1").reasons == "caf\u00e9"
+    assert clf._load_from_cache("k2").category_slug == "music"
+    assert clf._load_from_cache("k3") is None
+
+    clf._store_in_cache("k4", _ClassificationResult('house', 0.5, 'ok', ['house']), "", [])
+    clf.flush_cache()
+    reloaded = CategoryClassifier(config=make_config(llm_cache_path=str(cache_path)))
+    assert reloaded._load_from_cache("k4") == _ClassificationResult('house', 0.5, 'ok', ['house'])
+
+
+def test_category_classifier_cache_appends_are_buffered(tmp_path):
+    from src.pipelines.category_classifier import _CACHE_BUFFER_LINES
+    cache_path = tmp_path / "llm.jsonl"
+    clf = CategoryClassifier(config=make_config(llm_cache_path=str(cache_path)))
+    result = _ClassificationResult('house', 0.5, 'ok', [])
+
+    for i in range(_CACHE_BUFFER_LINES - 1):
+        clf._store_in_cache(f"k{i}", result, "", [])
+    assert not cache_path.exists()
+
+    # Reaching the threshold writes the whole buffer at once
+    clf._store_in_cache("last", result, "", [])
+    assert len(cache_path.read_text(encoding='utf-8').splitlines()) == _CACHE_BUFFER_LINES
+
+
+class _FixedCategoryClassifier(CategoryClassifier):
+    # Module level so process_many can send it to worker processes
+    def _classify_with_provider(self, text, categories):
+        return _ClassificationResult(category_slug='house', confidence=0.9, reasons='', suggestions=[])
+
+
+def test_category_classifier_cache_written_when_pipeline_closes(tmp_path):
+    from src.editor_pipeline import EditorPipeline
+    cache_path = tmp_path / "llm.jsonl"
+    pipeline = EditorPipeline()
+    pipeline.add_processor(_FixedCategoryClassifier(config=make_config(llm_cache_path=str(cache_path))))
+    items = [(f"note {i}", {}, {"filename": f"n{i}.txt"}) for i in range(5)]
+
+    pipeline.process(*items[0])
+    assert not cache_path.exists()
+    pipeline.close()
+    assert len(cache_path.read_text(encoding='utf-8').splitlines()) == 1
+
+    # Worker copies write what they buffered before the pool goes away
+    results = pipeline.process_many(items[1:], max_workers=2, chunksize=2)
+    assert [meta['category'] for _, meta in results] == ['house'] * 4
+    assert len(cache_path.read_text(encoding='utf-8').splitlines()) == 5
+
+
+def test_category_classifier_cache_key():
+    cats = [{"name": "B", "slug": "b"}, {"name": "A", "slug": "a"}]
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False, categories=cats))
+    key = clf._cache_key("text")
+    assert len(key) == 32
+    assert key == CategoryClassifier(config=make_config(llm_cache_enabled=False, categories=cats[::-1]))._cache_key("text")
+    assert key != CategoryClassifier(config=make_config(llm_cache_enabled=False, categories=cats[:1]))._cache_key("text")
+    assert key != clf._cache_key("text2")
+
+
+def test_category_classifier_reads_legacy_sha256_cache_keys(monkeypatch, tmp_path):
+    import hashlib
+    import json
+    cfg = make_config(llm_cache_path=str(tmp_path / "llm.jsonl"), categories=[{"name": "House", "slug": "house"}])
+    key_input = json.dumps({'text': "water heater", 'slugs': ['house', 'other'], 'provider': 'openai', 'model': ''}, sort_keys=True)
+    legacy_key = hashlib.sha256(key_input.encode('utf-8')).hexdigest()
+    (tmp_path / "llm.jsonl").write_text(
+        json.dumps({'key': legacy_key, 'result': {'category_slug': 'house', 'confidence': 0.9}}) + "\n", encoding='utf-8'
+    )
+
+    clf = CategoryClassifier(config=cfg)
+    monkeypatch.setattr(clf, "_classify_with_provider", lambda text, categories: pytest.fail("provider called"))
+    _, out_meta = clf.process("water heater", {}, {"filename": "n.txt"})
+
+    assert out_meta['category'] == 'house'
+    # The entry is re-stored under the current key, buffered until the next flush
+    assert clf._cache_key("water heater") not in (tmp_path / "llm.jsonl").read_text(encoding='utf-8')
+    clf.flush_cache()
+    assert clf._cache_key("water heater") in (tmp_path / "llm.jsonl").read_text(encoding='utf-8')
+
+
+def test_category_classifier_does_not_modify_config_categories():
+    cats = [{"name": "House", "slug": "house"}]
+    clf = CategoryClassifier(config=make_config(categories=cats, llm_cache_enabled=False))
+    assert clf._allowed_slugs == ('house', 'other')
+    assert cats == [{"name": "House", "slug": "house"}]
+
+
+def test_category_classifier_classify_batch(monkeypatch):
+    cfg = make_config(llm_cache_enabled=False)
+    clf = CategoryClassifier(config=cfg)
+    calls = []
+
+    def fake_provider(text, categories):
+        calls.append(text)
+        return _ClassificationResult(category_slug='house', confidence=0.9, reasons='', suggestions=[])
+
+    monkeypatch.setattr(clf, "_classify_with_provider", fake_provider)
+    items = [(f"note {i}", {}, {"filename": f"{i}.txt"}) for i in range(5)]
+    clf.classify_batch(items)
+    assert sorted(calls) == [f"note {i}" for i in range(5)]
+
+    # process() uses the prefetched results instead of calling the provider again
+    for content, metadata, context in items:
+        _, out_meta = clf.process(content, metadata, context)
+        assert out_meta.get('category') == 'house'
+    assert len(calls) == 5
+
+
+def test_category_classifier_classify_batch_duplicate_notes(monkeypatch):
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False))
+    calls = []
+
+    def fake_provider(text, categories):
+        calls.append(text)
+        return _ClassificationResult(category_slug='house', confidence=0.9, reasons='', suggestions=[])
+
+    monkeypatch.setattr(clf, "_classify_with_provider", fake_provider)
+    items = [("same text", {}, {"filename": f"{i}.txt"}) for i in range(3)]
+    clf.prepare_batch(items)
+
+    # Every copy reads the one prefetched result, which is then released
+    for content, metadata, context in items:
+        _, out_meta = clf.process(content, metadata, context)
+        assert out_meta.get('category') == 'house'
+    assert calls == ["same text"]
+    assert clf._prefetched == {} and clf._prefetch_refs == {}
+
+
+def test_category_classifier_classify_batch_releases_unused_prefetches(monkeypatch):
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False))
+
+    def failing_provider(texts, categories):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(clf, "_classify_many_with_provider", failing_provider)
+    clf.classify_batch([("same text", {}, {"filename": f"{i}.txt"}) for i in range(2)])
+    assert clf._prefetch_refs == {}
+
+    # Results left by a batch whose notes were never processed go when the next batch starts
+    monkeypatch.setattr(clf, "_classify_many_with_provider", lambda texts, categories: [
+        _ClassificationResult(category_slug='house', confidence=0.9, reasons='', suggestions=[]) for _ in texts
+    ])
+    clf.classify_batch([("first", {}, {"filename": "a.txt"})])
+    assert clf._prefetched
+    clf.classify_batch([("second", {}, {"filename": "b.txt"})])
+    assert set(clf._prefetched) == {clf._cache_key("second")}
+    assert set(clf._prefetch_refs) == {clf._cache_key("second")}
+
+
+def test_category_classifier_prepare_batch_runs_in_background(monkeypatch):
+    import threading
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False))
+    release = threading.Event()
+    calls = []
+
+    def fake_provider(text, categories):
+        release.wait(5)
+        calls.append(text)
+        return _ClassificationResult(category_slug='house', confidence=0.9, reasons='', suggestions=[])
+
+    monkeypatch.setattr(clf, "_classify_with_provider", fake_provider)
+    items = [(f"note {i}", {}, {"filename": f"{i}.txt"}) for i in range(3)]
+    clf.prepare_batch(items)
+    # prepare_batch returned while the requests are still blocked
+    assert calls == []
+
+    release.set()
+    # process() waits for the note's request instead of calling the provider again
+    for content, metadata, context in items:
+        _, out_meta = clf.process(content, metadata, context)
+        assert out_meta.get('category') == 'house'
+    assert sorted(calls) == [f"note {i}" for i in range(3)]
+
+
+def test_category_classifier_does_not_mutate_metadata(monkeypatch):
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False))
+    monkeypatch.setattr(clf, "_classify_with_provider",
+                        lambda text, categories: _ClassificationResult('house', 0.9, '', []))
+    metadata = {"tags": ["a"]}
+
+    _, out_meta = clf.process("text", metadata, {"filename": "n.txt"})
+
+    assert metadata == {"tags": ["a"]}
+    assert out_meta["category"] == 'house'
+    assert out_meta["tags"] == ["a"]
+
+
+def test_category_classifier_without_diagnostics(monkeypatch):
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False, llm_attach_diagnostics=False))
+    monkeypatch.setattr(clf, "_classify_with_provider",
+                        lambda text, categories: _ClassificationResult('house', 0.9, '', []))
+
+    _, out_meta = clf.process("text", {"tags": ["a"]}, {"filename": "n.txt"})
+
+    assert out_meta == {"tags": ["a"], "category": 'house'}
+
+
+def test_category_classifier_openai_reuses_connection(monkeypatch):
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    connections = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            connections.add(self.client_address)
+            self.rfile.read(int(self.headers['Content-Length']))
+            answer = {'category_slug': 'house', 'confidence': 0.9, 'reasons': 'r', 'suggestions': []}
+            body = json.dumps({'choices': [{'message': {'content': json.dumps(answer)}}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _set_proxy_env(monkeypatch)
+        monkeypatch.setenv('OPENAI_API_KEY', 'test')
+        cfg = make_config(llm_cache_enabled=False, llm_base_url=f'http://127.0.0.1:{server.server_port}/v1')
+        clf = CategoryClassifier(config=cfg)
+
+        for text in ("first note", "second note"):
+            _, out_meta = clf.process(text, {}, {"filename": "n.txt"})
+            assert out_meta.get('category') == 'house'
+        assert len(connections) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _start_local_server(handler):
+    import threading
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _set_proxy_env(monkeypatch, **proxies):
+    for name in ('http_proxy', 'https_proxy', 'no_proxy', 'all_proxy'):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+    for name, value in proxies.items():
+        monkeypatch.setenv(name, value)
+        monkeypatch.setenv(name.upper(), value)
+
+
+def test_category_classifier_openai_https_proxy_tunnel(monkeypatch):
+    from http.server import BaseHTTPRequestHandler
+
+    tunnels = []
+
+    class ProxyHandler(BaseHTTPRequestHandler):
+        def do_CONNECT(self):
+            tunnels.append((self.path, self.headers.get('Proxy-Authorization')))
+            # Accept the tunnel, then hang up instead of speaking TLS
+            self.send_response(200)
+            self.end_headers()
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = _start_local_server(ProxyHandler)
+    try:
+        _set_proxy_env(monkeypatch, https_proxy=f'http://user:pw@127.0.0.1:{server.server_port}')
+        monkeypatch.setenv('OPENAI_API_KEY', 'test')
+        clf = CategoryClassifier(config=make_config(llm_cache_enabled=False, llm_timeout_sec=5))
+
+        _, out_meta = clf.process("a note", {}, {"filename": "n.txt"})
+
+        assert tunnels and all(path == 'api.openai.com:443' for path, _ in tunnels)
+        assert tunnels[0][1] == 'Basic dXNlcjpwdw=='
+        assert out_meta['category'] == 'other'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_category_classifier_openai_http_proxy_and_no_proxy(monkeypatch):
+    import json
+    from http.server import BaseHTTPRequestHandler
+
+    paths = []
+
+    class ProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            paths.append(self.path)
+            self.rfile.read(int(self.headers['Content-Length']))
+            answer = {'category_slug': 'house', 'confidence': 0.9, 'reasons': 'r', 'suggestions': []}
+            body = json.dumps({'choices': [{'message': {'content': json.dumps(answer)}}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = _start_local_server(ProxyHandler)
+    try:
+        _set_proxy_env(monkeypatch, http_proxy=f'http://127.0.0.1:{server.server_port}', no_proxy='internal.example')
+        monkeypatch.setenv('OPENAI_API_KEY', 'test')
+        clf = CategoryClassifier(config=make_config(llm_cache_enabled=False, llm_base_url='http://llm.example/v1'))
+
+        _, out_meta = clf.process("a note", {}, {"filename": "n.txt"})
+
+        assert out_meta['category'] == 'house'
+        assert paths == ['http://llm.example/v1/chat/completions']
+        assert clf._proxy_for('http', 'internal.example:8080') is None
+        assert clf._proxy_for('https', 'llm.example') is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_category_classifier_classify_batch_closes_connections(monkeypatch):
+    clf = CategoryClassifier(config=make_config(llm_cache_enabled=False))
+    opened = []
+
+    class FakeConnection:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def fake_provider(text, categories):
+        # Stands in for _post opening this pool thread's keep-alive connection
+        if getattr(clf._http, 'conn', None) is None:
+            clf._http.conn = FakeConnection()
+            opened.append(clf._http.conn)
+        return _ClassificationResult(category_slug='house', confidence=0.9, reasons='', suggestions=[])
+
+    monkeypatch.setattr(clf, "_classify_with_provider", fake_provider)
+    clf.classify_batch([(f"note {i}", {}, {"filename": f"{i}.txt"}) for i in range(6)], max_workers=3)
+
+    assert opened and all(conn.closed for conn in opened)
+
+
+def test_category_classifier_prompt(monkeypatch):
+    cats = [{"name": "House", "slug": "house", "description": "Home stuff"}]
+    clf = CategoryClassifier(config=make_config(categories=cats, llm_cache_enabled=False))
+    captured = {}
+
+    def fake_openai(user_prompt, allowed_slugs):
+        captured['prompt'] = user_prompt
+        captured['slugs'] = allowed_slugs
+        return _ClassificationResult(category_slug=None, confidence=0.0, reasons='', suggestions=[], undecided=True)
+
+    monkeypatch.setattr(clf, "_classify_openai", fake_openai)
+    clf.process("Fix the roof", {}, {"filename": "n.txt"})
+
+    assert captured['slugs'] == ['house', 'other']
+    assert "Allowed slugs: ['house', 'other']\n" in captured['prompt']
+    assert "'house': 'Home stuff'" in captured['prompt']
+    assert captured['prompt'].endswith("Text:\nFix the roof\n")
+
+
+def test_category_classifier_classify_batch_multi_note_requests(monkeypatch):
+    cfg = make_config(llm_cache_enabled=False, llm_batch_size=3)
+    clf = CategoryClassifier(config=cfg)
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    prompts = []
+
+    def fake_openai_json(user_prompt, api_key):
+        prompts.append(user_prompt)
+        if user_prompt.count("Note ") > 1:
+            # Leave the last note of each batch out of the reply
+            count = user_prompt.count("Note ")
+            return {'results': [{'id': i, 'category_slug': 'music', 'confidence': 0.9} for i in range(1, count)]}, None
+        return {'category_slug': 'house', 'confidence': 0.9}, None
+
+    monkeypatch.setattr(clf, "_openai_json", fake_openai_json)
+    items = [(f"note {i}", {}, {"filename": f"{i}.txt"}) for i in range(5)]
+    clf.classify_batch(items)
+
+    # Two batch requests (3 + 2 notes) plus one single request for each note left out
+    assert len(prompts) == 4
+    assert any(p.endswith("Note 1:\nnote 0\n\nNote 2:\nnote 1\n\nNote 3:\nnote 2\n\n") for p in prompts)
+    categories = [clf.process(*item)[1]['category'] for item in items]
+    assert categories == ['music', 'music', 'house', 'music', 'house']
+
+
+def test_category_classifier_classify_batch_cache_writes(monkeypatch, tmp_path):
+    import pickle
+    cfg = make_config(llm_cache_path=str(tmp_path / "llm.jsonl"), llm_concurrency=8)
+    clf = CategoryClassifier(config=cfg)
+    monkeypatch.setattr(clf, "_classify_with_provider",
+                        lambda text, categories: _ClassificationResult('house', 0.9, text, []))
+
+    clf.classify_batch([(f"note {i}", {}, {"filename": f"{i}.txt"}) for i in range(50)])
+
+    # Written by the batch's final flush, without waiting for exit
+    lines = (tmp_path / "llm.jsonl").read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 50
+    reloaded = pickle.loads(pickle.dumps(CategoryClassifier(config=cfg)))
+    assert {reloaded._load_from_cache(reloaded._cache_key(f"note {i}")).reasons for i in range(50)} == {f"note {i}" for i in range(50)}
+
+
 def test_tag_injector_propagates_category_tag():
     injector = TagInjector(tag_rules={}, propagate_category_tag=True)
     content = "- item 1\n- item 2\n- item 3\n- item 4"  # triggers 'lists' maybe
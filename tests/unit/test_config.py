@@ -207,6 +207,19 @@ class TestImportConfig:
         assert preset.enable_editor_pipeline is True
         assert preset.enable_auto_tagging is True
 
+    
+    def test_get_phase2_preset_returns_fresh_instance(self):
+        """Test mutating a returned preset does not leak into later calls"""
+        config = ImportConfig()
+        first = config.get_phase2_preset('organized')
+        first.enable_llm_categorization = True
+        first.custom_folder_rules['work'] = 'work'
+        
+        second = config.get_phase2_preset('organized')
+        
+        assert second is not first
+        assert second.enable_llm_categorization is False
+        assert second.custom_folder_rules == {}
 
 class TestConfigManager:
     """Test cases for ConfigManager class"""
@@ -299,6 +312,22 @@ class TestConfigManager:
         assert 'custom_tag_rules' in content
         assert 'Phase 2 Features' in content
     
+    def test_create_sample_config_is_valid_yaml(self, temp_dir):
+        """Test the sample config parses as YAML and loads into ImportConfig"""
+        manager = ConfigManager(temp_dir)
+        sample_file = temp_dir / "sample.yaml"
+        
+        manager.create_sample_config(sample_file)
+        
+        with open(sample_file, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        assert data['llm_base_url'] is None
+        assert not any(key.startswith('#') for key in data)
+        
+        loaded = ImportConfig.load_from_file(sample_file)
+        assert loaded.llm_model == 'gpt-4o-mini'
+        assert loaded.custom_folder_rules['gaming'] == 'entertainment/games'
+    
     def test_create_sample_config_default_location(self, temp_dir):
         """Test creating sample config at default location"""
         manager = ConfigManager(temp_dir)
@@ -337,6 +366,14 @@ class TestConfigManager:
         assert len(warnings) > 0
         assert any('output_format' in warning for warning in warnings)
     
+    def test_validate_config_invalid_frontmatter_format(self, temp_dir):
+        """Test validating config with invalid frontmatter format"""
+        manager = ConfigManager(temp_dir)
+        
+        assert manager.validate_config(ImportConfig(frontmatter_format='json')) == []
+        warnings = manager.validate_config(ImportConfig(frontmatter_format='toml'))
+        assert any('frontmatter_format' in warning for warning in warnings)
+    
     def test_validate_config_conflicting_settings(self, temp_dir):
         """Test validating config with conflicting settings"""
         manager = ConfigManager(temp_dir)
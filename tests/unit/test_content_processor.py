@@ -71,6 +71,16 @@ class TestContentProcessor:
         assert "café" in content
         assert "résumé" in content
     
+    def test_read_note_content_normalizes_newlines(self, temp_dir):
+        """Test CRLF and lone CR line endings are read back as LF"""
+        note_file = temp_dir / "windows.txt"
+        note_file.write_bytes(b"Title\r\nLine two\rLine three\n")
+        
+        processor = ContentProcessor(temp_dir)
+        content = processor.read_note_content(note_file)
+        
+        assert content == "Title\nLine two\nLine three"
+    
     def test_read_note_content_nonexistent_file(self, temp_dir):
         """Test reading from nonexistent file"""
         processor = ContentProcessor(temp_dir)
@@ -265,6 +275,17 @@ class TestContentProcessor:
         assert len(notes) == 1
         assert notes[0]['filename'] == "valid.txt"
     
+    def test_process_all_notes_preserves_file_order(self, temp_dir):
+        """Test threaded reads return notes in the same order as get_txt_files"""
+        for i in range(20):
+            (temp_dir / f"note{i:02d}.txt").write_text(f"Note {i}\nContent {i}")
+        
+        processor = ContentProcessor(temp_dir, max_workers=4)
+        expected = [f.name for f in processor.get_txt_files()]
+        notes = processor.process_all_notes()
+        
+        assert [n['filename'] for n in notes] == expected
+    
     @pytest.mark.edge_case
     def test_extract_title_very_long_first_line(self, temp_dir):
         """Test title extraction with very long first line"""
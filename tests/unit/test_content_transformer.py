@@ -123,6 +123,15 @@ class TestContentTransformer:
         assert result_content == "bar says hi universe"
         assert result_metadata == metadata
     
+    def test_process_rules_updated_after_init(self):
+        """Test rules added after construction are applied"""
+        transformer = ContentTransformer(transformation_rules={r'foo': 'bar'})
+        transformer.transformation_rules.update({r'hello': 'hi'})
+        
+        result_content, _ = transformer.process("foo says hello", {"tags": []}, {})
+        
+        assert result_content == "bar says hi"
+    
     def test_clean_whitespace_trailing_spaces(self):
         """Test whitespace cleaning removes trailing spaces"""
         transformer = ContentTransformer()
@@ -159,6 +168,14 @@ class TestContentTransformer:
         assert "Second line" in result
         assert "Third line" in result
     
+    def test_clean_whitespace_whitespace_only_lines(self):
+        """Test whitespace-only lines count as blank and at most 2 are kept"""
+        transformer = ContentTransformer()
+        
+        result = transformer._clean_whitespace("a \n \n\t\n  \n\r\nb\t")
+        
+        assert result == "a\n\n\nb"
+    
     def test_clean_whitespace_preserves_single_blank_lines(self):
         """Test whitespace cleaning preserves single blank lines"""
         transformer = ContentTransformer()
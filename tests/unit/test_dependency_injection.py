@@ -11,7 +11,7 @@ from src.metadata_parser import MetadataParser
 from src.content_processor import ContentProcessor
 from src.obsidian_formatter import ObsidianFormatter
 from src.simplenote_importer import SimpleNoteImporter
-from src.interfaces import MockFileSystem
+from src.interfaces import MockFileSystem, RealFileSystem
 from src.config import ImportConfig
 
 
@@ -230,6 +230,53 @@ class TestDependencyInjection:
         with pytest.raises(FileExistsError):
             mock_file_system.mkdir(Path("/test"), exist_ok=False)
     
+    def test_mock_file_system_glob(self, mock_file_system):
+        """Test mock glob matches files under the directory only, once each"""
+        mock_file_system.add_file("/notes/a.txt", "A")
+        mock_file_system.add_file("/notes/sub/b.txt", "B")
+        mock_file_system.add_file("/notes/c.md", "C")
+        mock_file_system.add_file("/notes-other/d.txt", "D")
+        mock_file_system.write_text(Path("/notes/a.txt"), "A2")
+        
+        result = mock_file_system.glob(Path("/notes"), "*.txt")
+        
+        assert result == [Path("/notes/a.txt"), Path("/notes/sub/b.txt")]
+        assert mock_file_system.glob(Path("/missing"), "*.txt") == []
+    
+    def test_write_many(self, mock_file_system, temp_dir):
+        """Test batch writes report a per-item result in order"""
+        errors = mock_file_system.write_many([(Path("/out/a.md"), "A"), (Path("/out/b.md"), "B")])
+        assert errors == [None, None]
+        assert mock_file_system.read_text(Path("/out/b.md")) == "B"
+        
+        items = [(temp_dir / f"{i}.md", str(i)) for i in range(5)]
+        items.append((temp_dir / "missing" / "x.md", "X"))
+        errors = RealFileSystem().write_many(items)
+        assert errors[:5] == [None] * 5
+        assert isinstance(errors[5], FileNotFoundError)
+        assert (temp_dir / "3.md").read_text(encoding='utf-8') == "3"
+    
+    def test_write_parts(self, mock_file_system, temp_dir):
+        """Test files written from pieces match the joined content"""
+        parts = ['---\n', 'title: Café\n', '---\n\n', 'Body']
+        
+        mock_file_system.write_parts(Path("/out/a.md"), parts)
+        assert mock_file_system.read_text(Path("/out/a.md")) == ''.join(parts)
+        
+        RealFileSystem().write_parts(temp_dir / "a.md", parts)
+        assert (temp_dir / "a.md").read_text(encoding='utf-8') == ''.join(parts)
+    
+    def test_open_binary(self, mock_file_system, temp_dir):
+        """Test binary streaming reads on both file system implementations"""
+        mock_file_system.add_file("/test/notes.json", '{"title": "Café"}')
+        with mock_file_system.open_binary(Path("/test/notes.json")) as f:
+            assert f.read() == '{"title": "Café"}'.encode('utf-8')
+        
+        real_path = temp_dir / "notes.json"
+        real_path.write_bytes(b'{"a": 1}')
+        with RealFileSystem().open_binary(real_path) as f:
+            assert f.read() == b'{"a": 1}'
+    
     def test_backward_compatibility(self, temp_dir):
         """Test that refactored classes still work without dependency injection"""
         # Test that classes work with default file system (None passed)
@@ -226,6 +226,40 @@ class TestEditorPipeline:
         assert result_metadata["processed_by_test_processor"] is True
         assert result_metadata["original"] is True  # Original keys preserved
     
+    def test_process_after_processor_list_changes(self):
+        """Test processors added or removed between calls are honoured"""
+        pipeline = EditorPipeline()
+        processor1 = MockProcessor("processor1")
+        processor2 = MockProcessor("processor2")
+        pipeline.add_processor(processor1)
+        
+        pipeline.process("Test", {}, {})
+        pipeline.add_processor(processor2)
+        result_content, _ = pipeline.process("Test", {}, {})
+        assert result_content == "Test [processed by processor1] [processed by processor2]"
+        
+        pipeline.remove_processor("processor1")
+        result_content, _ = pipeline.process("Test", {}, {})
+        assert result_content == "Test [processed by processor2]"
+        assert processor1.call_count == 2
+        
+        pipeline.processors = [processor1]
+        result_content, _ = pipeline.process("Test", {}, {})
+        assert result_content == "Test [processed by processor1]"
+    
+    def test_process_many_matches_process(self):
+        """Test batch processing across workers matches sequential results in order"""
+        pipeline = EditorPipeline().get_default_pipeline()
+        items = [
+            (f"#Note {i}\n\n\n\n* item   ", {"tags": ["programming"] if i % 2 else []}, {"filename": f"note{i}.txt"})
+            for i in range(6)
+        ]
+        
+        expected = [pipeline.process(*item) for item in items]
+        
+        assert pipeline.process_many(items, max_workers=2, chunksize=2) == expected
+        assert pipeline.process_many(items, max_workers=1) == expected
+    
     def test_get_default_pipeline(self):
         """Test creation of default pipeline"""
         pipeline = EditorPipeline()
@@ -102,6 +102,54 @@ class TestMetadataParser:
         with pytest.raises(FileNotFoundError):
             parser.parse()
     
+    def test_parse_from_content_bytes_and_nonstandard_json(self, temp_dir):
+        """Test UTF-8 bytes are accepted and stdlib-only JSON still parses"""
+        parser = MetadataParser(temp_dir / "dummy.json")
+        
+        result = parser.parse_from_content('{"activeNotes": [{"content": "Café Notes"}]}'.encode('utf-8'))
+        assert "Café Notes.txt" in result
+        
+        result = parser.parse_from_content('{"activeNotes": [{"content": "NaN Note", "score": NaN}]}')
+        assert "NaN Note.txt" in result
+    
+    def test_parse_streams_with_ijson(self, temp_dir, monkeypatch):
+        """Test the ijson streaming path parses notes and converts its errors"""
+        class IjsonStub:
+            """Yields activeNotes items one by one, failing at the first malformed item"""
+            class JSONError(Exception):
+                pass
+            
+            @staticmethod
+            def items(f, prefix):
+                assert prefix == 'activeNotes.item'
+                text = f.read().decode('utf-8')
+                decoder = json.JSONDecoder()
+                pos = text.index('[') + 1
+                while True:
+                    pos += len(text[pos:]) - len(text[pos:].lstrip(' ,\n'))
+                    if text.startswith(']', pos):
+                        return
+                    try:
+                        item, pos = decoder.raw_decode(text, pos)
+                    except ValueError as e:
+                        raise IjsonStub.JSONError(str(e))
+                    yield item
+        
+        monkeypatch.setattr('src.metadata_parser.ijson', IjsonStub)
+        
+        json_path = temp_dir / "notes.json"
+        json_path.write_text('{"activeNotes": [{"content": "First", "tags": ["a"]}, {"content": "Café"}]}', encoding='utf-8')
+        parser = MetadataParser(json_path)
+        result = parser.parse()
+        assert set(result) == {"First.txt", "Café.txt"}
+        assert result["First.txt"]['tags'] == ["a"]
+        
+        # A malformed note after a good one raises the json error type and adds nothing
+        json_path.write_text('{"activeNotes": [{"content": "Second"}, {bad}]}', encoding='utf-8')
+        with pytest.raises(json.JSONDecodeError):
+            parser.parse()
+        assert set(parser.metadata_map) == {"First.txt", "Café.txt"}
+    
     def test_extract_metadata(self, temp_dir):
         """Test metadata extraction from individual note"""
         parser = MetadataParser(temp_dir / "dummy.json")
@@ -140,6 +188,19 @@ class TestMetadataParser:
         result = parser._parse_timestamp('2024-01-01 10:00:00')
         assert isinstance(result, datetime)
     
+    def test_parse_timestamp_matches_dateutil(self, temp_dir):
+        """Test the ISO fast path gives the same result as dateutil"""
+        from dateutil.parser import parse
+        parser = MetadataParser(temp_dir / "dummy.json")
+        
+        for timestamp in ['2024-01-01T10:00:00.000Z', '2024-01-01T10:00:00+02:00', '2024-01-01 10:00:00']:
+            result = parser._parse_timestamp(timestamp)
+            assert result == parse(timestamp)
+            assert result.isoformat() == parse(timestamp).isoformat()
+        
+        # Non-ISO formats still fall back to dateutil
+        assert parser._parse_timestamp('Jan 1 2024 10:00') == datetime(2024, 1, 1, 10, 0)
+    
     def test_parse_timestamp_invalid(self, temp_dir):
         """Test handling of invalid timestamp strings"""
         parser = MetadataParser(temp_dir / "dummy.json")
@@ -6,6 +6,7 @@ import pytest
 import yaml
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from src.obsidian_formatter import ObsidianFormatter
 
@@ -76,6 +77,14 @@ class TestObsidianFormatter:
         assert 'markdown: true' in formatted
         assert 'pinned: false' in formatted
     
+    def test_format_note_keeps_frontmatter_key_order(self, temp_dir):
+        """Test frontmatter keys are written in creation order, title first"""
+        formatter = ObsidianFormatter(temp_dir)
+        
+        formatted = formatter.format_note({'title': 'Ordered', 'content': ''}, {'original_id': 'x', 'tags': ['a']})
+        
+        assert formatted.startswith('---\ntitle: Ordered\nsource: simplenote\noriginal_id: x\ntags:\n- a\n---\n')
+    
     def test_create_frontmatter_minimal(self, temp_dir):
         """Test frontmatter creation with minimal data"""
         formatter = ObsidianFormatter(temp_dir)
@@ -346,6 +355,74 @@ class TestObsidianFormatter:
         assert 'title: Second Note' in content
         assert 'original_id: id-2' in content
     
+    def test_save_all_notes_duplicate_titles(self, temp_dir):
+        """Test notes with the same title in one batch get distinct files"""
+        formatter = ObsidianFormatter(temp_dir)
+        
+        notes = [
+            {'filename': 'a.txt', 'title': 'Same Title', 'content': 'First'},
+            {'filename': 'b.txt', 'title': 'Same Title', 'content': 'Second'}
+        ]
+        
+        saved_files = formatter.save_all_notes(notes, {})
+        
+        assert saved_files['a.txt'].name == "Same Title.md"
+        assert saved_files['b.txt'].name == "Same Title_1.md"
+        assert saved_files['b.txt'].read_text(encoding='utf-8').endswith('Second')
+    
+    def test_save_note_avoids_existing_and_external_files(self, temp_dir):
+        """Test conflicts are found for pre-existing files and files created later"""
+        (temp_dir / "Taken.md").write_text("existing", encoding='utf-8')
+        formatter = ObsidianFormatter(temp_dir)
+        
+        first_path = formatter.save_note({'title': 'Taken', 'content': 'x'})
+        (temp_dir / "Other.md").write_text("external", encoding='utf-8')
+        second_path = formatter.save_note({'title': 'Other', 'content': 'y'})
+        
+        assert first_path.name == "Taken_1.md"
+        assert second_path.name == "Other_1.md"
+        assert (temp_dir / "Other.md").read_text(encoding='utf-8') == "external"
+    
+    def test_save_note_titles_differing_in_case(self, temp_dir):
+        """Test titles that differ only in case get distinct names on any file system"""
+        (temp_dir / "Existing.md").write_text("existing", encoding='utf-8')
+        formatter = ObsidianFormatter(temp_dir)
+        
+        first = formatter.save_note({'title': 'Foo', 'content': '1'})
+        second = formatter.save_note({'title': 'foo', 'content': '2'})
+        third = formatter.save_note({'title': 'EXISTING', 'content': '3'})
+        
+        assert first.name == "Foo.md"
+        assert second.name == "foo_1.md"
+        assert third.name == "EXISTING_1.md"
+        assert first.read_text(encoding='utf-8').endswith('1')
+    
+    def test_save_note_concurrent_same_title(self, temp_dir):
+        """Test save_note called from several threads never reuses a filename"""
+        from concurrent.futures import ThreadPoolExecutor
+        formatter = ObsidianFormatter(temp_dir)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            paths = list(executor.map(
+                lambda i: formatter.save_note({'title': 'Same', 'content': str(i)}), range(40)
+            ))
+        
+        assert len({path.name for path in paths}) == 40
+        assert len(list(temp_dir.glob('Same*.md'))) == 40
+    
+    def test_save_all_notes_creates_each_folder_once(self, temp_dir):
+        """Test a folder shared by several notes is only created once"""
+        formatter = ObsidianFormatter(temp_dir)
+        
+        notes = [{'filename': f'{i}.txt', 'title': f'Note {i}', 'content': 'x'} for i in range(3)]
+        metadata_map = {f'{i}.txt': {'_folder_path': 'recipes'} for i in range(3)}
+        
+        with patch.object(formatter.file_system, 'mkdir', wraps=formatter.file_system.mkdir) as mkdir:
+            saved_files = formatter.save_all_notes(notes, metadata_map)
+        
+        assert mkdir.call_count == 1
+        assert all(path.parent == temp_dir / 'recipes' for path in saved_files.values())
+    
     def test_save_all_notes_with_errors(self, temp_dir):
         """Test saving notes when some fail"""
         formatter = ObsidianFormatter(temp_dir)
@@ -415,6 +492,49 @@ class TestObsidianFormatter:
         parsed = yaml.safe_load(yaml_content)
         assert parsed['title'] == 'Title: with "quotes" and other: special chars'
     
+    @pytest.mark.edge_case
+    def test_format_note_fast_frontmatter_matches_yaml_dump(self, temp_dir):
+        """Test directly written frontmatter loads the same as yaml.dump output"""
+        fast = ObsidianFormatter(temp_dir)
+        slow = ObsidianFormatter(temp_dir, fast_frontmatter=False)
+        
+        metadata = {
+            'original_id': '0123abc',
+            'created': datetime(2024, 1, 1, 10, 0, 0),
+            'tags': ['yes', '123', 'café', '#hash', 'a: b'],
+            'markdown': True,
+            'pinned': False
+        }
+        for title in ['Plain Title', 'null', '1:20', "it's - [x] # {y}", 'line\u2028break\x85', '']:
+            note_data = {'title': title, 'content': 'Body'}
+            
+            fast_yaml = fast.format_note(note_data, metadata).split('---\n')[1]
+            slow_yaml = slow.format_note(note_data, metadata).split('---\n')[1]
+            
+            assert yaml.safe_load(fast_yaml) == yaml.safe_load(slow_yaml)
+        
+        assert 'created: 2024-01-01T10:00:00\n' in fast.format_note({'title': 'T'}, metadata)
+    
+    def test_format_note_json_frontmatter(self, temp_dir):
+        """Test JSON frontmatter is valid YAML with the same fields"""
+        import json
+        formatter = ObsidianFormatter(temp_dir, frontmatter_format='json')
+        
+        metadata = {'created': datetime(2024, 1, 1, 10, 0, 0), 'tags': ['café', 'a: b'], 'pinned': True}
+        result = formatter.format_note({'title': 'line\u2028break', 'content': 'Body'}, metadata)
+        
+        assert result.startswith('---\n{')
+        assert result.endswith('}\n---\n\nBody')
+        frontmatter = result.split('---\n')[1]
+        assert yaml.safe_load(frontmatter) == json.loads(frontmatter)
+        assert json.loads(frontmatter) == {
+            'title': 'line\u2028break',
+            'source': 'simplenote',
+            'created': '2024-01-01T10:00:00',
+            'tags': ['café', 'a: b'],
+            'pinned': True
+        }
+    
     @pytest.mark.edge_case
     def test_save_note_very_long_filename(self, temp_dir):
         """Test saving note with very long title"""
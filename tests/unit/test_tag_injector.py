@@ -5,7 +5,7 @@ Unit tests for TagInjector processor.
 import pytest
 from typing import Dict, Any, List
 
-from src.pipelines.tag_injector import TagInjector
+from src.pipelines.tag_injector import TagInjector, _literal_keywords, _required_literals
 
 
 class TestTagInjector:
@@ -155,6 +155,16 @@ class TestTagInjector:
         assert result_content == content
         assert result_metadata == metadata
     
+    def test_should_process_tag_filters(self):
+        """Test enabled and disabled tag filters"""
+        injector = TagInjector(enabled_tags=['work', 'home'], disabled_tags=['skip'])
+        
+        assert injector.should_process({"tags": ["home"]}, {})
+        assert not injector.should_process({"tags": ["home", "skip"]}, {})
+        assert not injector.should_process({"tags": ["other"]}, {})
+        assert not injector.should_process({}, {})
+        assert TagInjector().should_process({}, {})
+    
     def test_extract_filename_tags_date_patterns(self):
         """Test filename tag extraction for date patterns"""
         injector = TagInjector()
@@ -301,6 +311,109 @@ class TestTagInjector:
         assert "work" in tags
         assert "collaboration" in tags
     
+    def test_extract_content_tags_backreference_rule(self):
+        """Test rules with backreferences still match when fused scanning is skipped"""
+        tag_rules = {
+            r'(ha)\1': ['funny'],
+            'meeting': ['work']
+        }
+        
+        injector = TagInjector(tag_rules=tag_rules)
+        
+        tags = injector._extract_content_tags("haha, a meeting")
+        assert "funny" in tags
+        assert "work" in tags
+    
+    def test_extract_content_tags_inline_ignorecase_rule(self):
+        """Test rules with an inline (?i) flag fuse with the other rules"""
+        tag_rules = {
+            '(?i)meetings?': ['work'],
+            r'\bdeadline\b': ['urgent']
+        }
+        
+        injector = TagInjector(tag_rules=tag_rules)
+        
+        tags = injector._extract_content_tags("MEETING about the Deadline")
+        assert injector._combined_re is not None
+        assert "work" in tags
+        assert "urgent" in tags
+    
+    def test_process_interns_tags(self):
+        """Test equal tags from different notes share one string object"""
+        injector = TagInjector(tag_rules={'meeting': [''.join(['wo', 'rk'])]})
+        
+        _, first = injector.process("meeting notes", {"tags": [''.join(['pro', 'ject'])]}, {})
+        _, second = injector.process("another meeting", {"tags": [''.join(['pro', 'ject'])]}, {})
+        
+        assert first['tags'] == ['project', 'work']
+        assert all(a is b for a, b in zip(first['tags'], second['tags']))
+    
+    def test_literal_keywords_detection(self):
+        """Test keyword-only rules are recognised and regex rules are not"""
+        assert _literal_keywords('(?i)(Cocktail|gin|dark rum)') == ['cocktail', 'gin', 'dark rum']
+        assert _literal_keywords('meeting') == ['meeting']
+        assert _literal_keywords(r'\bgin\b') is None
+        assert _literal_keywords('todo.*') is None
+    
+    def test_required_literals_detection(self):
+        """Test a required literal is found for each alternative of simple rules"""
+        assert _required_literals(r'(?i)drum.*bass|dnb|jungle') == ['drum', 'dnb', 'jungle']
+        assert _required_literals(r'\bcolou?r\b') == ['colo']
+        assert _required_literals(r'gin|x*') is None
+        assert _required_literals(r'(drum|bass)line') is None
+    
+    def test_extract_content_tags_prefiltered_rules(self):
+        """Test prefiltered regex rules still match with and without their literals"""
+        tag_rules = {
+            r'(ha)\1': ['funny'],
+            r'drum.*bass|\bdnb\b': ['music']
+        }
+        
+        injector = TagInjector(tag_rules=tag_rules)
+        
+        assert injector._extract_content_tags("haha DRUM and BASS") == {"funny", "music"}
+        assert injector._extract_content_tags("haha, dnb night") == {"funny", "music"}
+        assert injector._extract_content_tags("a drum solo") == set()
+    
+    def test_extract_content_tags_keyword_automaton(self):
+        """Test keyword-only rules matched by the automaton alongside regex rules"""
+        pytest.importorskip('ahocorasick')
+        tag_rules = {
+            'cocktail|gin': ['drinks'],
+            r'\bsoup\b': ['recipes'],
+            'Meeting': ['work']
+        }
+        
+        injector = TagInjector(tag_rules=tag_rules)
+        
+        tags = injector._extract_content_tags("Gin and SOUP after the MEETING")
+        assert injector._automaton is not None
+        assert tags == {"drinks", "recipes", "work"}
+    
+    def test_extract_content_tags_keyword_substring_checks(self, monkeypatch):
+        """Test keyword-only rules use substring checks when pyahocorasick is missing"""
+        monkeypatch.setattr('src.pipelines.tag_injector.ahocorasick', None)
+        tag_rules = {
+            'cocktail|gin': ['drinks'],
+            r'\bsoup\b': ['recipes'],
+            'Meeting': ['work']
+        }
+        
+        injector = TagInjector(tag_rules=tag_rules)
+        
+        assert injector._regex_indices == [1]
+        assert injector._extract_content_tags("Gin and SOUP after the MEETING") == {"drinks", "recipes", "work"}
+        assert injector._extract_content_tags("soupy engine") == {"drinks"}
+    
+    def test_extract_content_tags_rules_updated_after_init(self):
+        """Test rules added after construction are picked up"""
+        injector = TagInjector(tag_rules={'meeting': ['work']})
+        injector.tag_rules['deadline'] = ['urgent']
+        
+        tags = injector._extract_content_tags("meeting before the deadline")
+        assert "work" in tags
+        assert "urgent" in tags
+    
     @pytest.mark.edge_case
     def test_process_empty_content(self):
         """Test processing empty content"""
@@ -351,7 +464,7 @@ class TestTagInjector:
         injector = TagInjector()
         
         tags = injector._extract_filename_tags("")
-        assert tags == []
+        assert tags == set()
     
     @pytest.mark.edge_case  
     def test_extract_content_tags_empty_content(self):
@@ -359,7 +472,7 @@ class TestTagInjector:
         injector = TagInjector()
         
         tags = injector._extract_content_tags("")
-        assert tags == []
+        assert tags == set()
     
     @pytest.mark.integration
     def test_complex_processing_scenario(self):